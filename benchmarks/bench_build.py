@@ -0,0 +1,116 @@
+# Times each parsing stage and the whole build on a synthetic corpus and
+# writes the results as JSON so runs can be compared across commits.
+# Run from the repo root:
+#   PYTHONPATH=. python3 benchmarks/bench_build.py --pages 200 --output before.json
+#   PYTHONPATH=. python3 benchmarks/bench_build.py --pages 200 --compare before.json
+import argparse, contextlib, io, json, os, platform, shutil, statistics, subprocess, sys, tempfile, time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from corpus import add_corpus_arguments, corpus_kwargs, generate_corpus
+from src.block_cache import configure_block_cache
+from src.blocktype import BlockType, classify_block, markdown_to_html_node
+from src.inline_markdown import markdown_to_blocks, text_to_textnodes
+from src.main import main as build_main
+
+def time_runs(function, repeat, setup=None):
+    runs = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        function()
+        runs.append(time.perf_counter() - start)
+    return {"min": min(runs), "median": statistics.median(runs), "runs": runs}
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def bench_stages(documents, repeat):
+    # Parse without the block cache so every run does the same work
+    configure_block_cache(0)
+    blocks = [markdown_to_blocks(document) for document in documents]
+    inline_texts = []
+    for document_blocks in blocks:
+        for block in document_blocks:
+            block_type, lines = classify_block(block)
+            if block_type == BlockType.PARAGRAPH:
+                inline_texts.append(" ".join(lines))
+    trees = [markdown_to_html_node(document) for document in documents]
+    return {
+        "markdown_to_blocks": time_runs(lambda: [markdown_to_blocks(d) for d in documents], repeat),
+        "text_to_textnodes": time_runs(lambda: [text_to_textnodes(t) for t in inline_texts], repeat),
+        "markdown_to_html_node": time_runs(lambda: [markdown_to_html_node(d) for d in documents], repeat),
+        "to_html": time_runs(lambda: [tree.to_html() for tree in trees], repeat),
+    }
+
+def bench_build(site_dir, repeat, jobs):
+    # main() works on ./content and ./docs, so run it inside the corpus
+    build_args = ["-j", str(jobs)]
+
+    def run_build():
+        with contextlib.redirect_stdout(io.StringIO()):
+            build_main(build_args)
+
+    def clear_outputs():
+        for path in ("docs", ".cache"):
+            shutil.rmtree(path, ignore_errors=True)
+
+    cwd = os.getcwd()
+    os.chdir(site_dir)
+    try:
+        cold = time_runs(run_build, repeat, setup=clear_outputs)
+        # Nothing changed since the last run: every page is skipped
+        warm = time_runs(run_build, repeat)
+    finally:
+        os.chdir(cwd)
+    return {"build_cold": cold, "build_warm": warm}
+
+def print_results(results, baseline=None):
+    for name, result in results["results"].items():
+        line = f"{name:<24} {result['min'] * 1000:10.2f} ms min {result['median'] * 1000:10.2f} ms median"
+        if baseline is not None and name in baseline["results"]:
+            ratio = result["min"] / baseline["results"][name]["min"]
+            line += f"  {ratio:5.2f}x vs {baseline.get('commit') or 'baseline'}"
+        print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the parser stages and the full build.")
+    add_corpus_arguments(parser)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="worker processes for the full build")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="JSON results of an earlier run to compare against")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as site_dir:
+        paths = generate_corpus(site_dir, **corpus_kwargs(args))
+        documents = []
+        for path in paths:
+            with open(path, 'r') as f:
+                documents.append(f.read())
+        results = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "settings": vars(args),
+            "corpus": {"pages": len(documents), "bytes": sum(len(d.encode()) for d in documents)},
+            "results": {},
+        }
+        results["results"].update(bench_stages(documents, args.repeat))
+        results["results"].update(bench_build(site_dir, args.repeat, args.jobs))
+
+    print(f"{results['corpus']['pages']} pages, {results['corpus']['bytes'] / 1e6:.2f} MB of markdown")
+    baseline = None
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            baseline = json.load(f)
+    print_results(results, baseline)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=1)
+
+if __name__ == "__main__":
+    main()
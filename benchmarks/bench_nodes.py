@@ -0,0 +1,34 @@
+# Measures memory and allocation time of the node classes.
+# Run from the repo root: PYTHONPATH=. python3 benchmarks/bench_nodes.py
+import sys, time, tracemalloc
+from src.blocktype import text_to_children
+from src.textnode import TextNode, TextType, text_node_to_html_node
+
+PARAGRAPH = (
+    "This is **text** with an _italic_ word and a `code block` and an "
+    "![obi wan image](https://i.imgur.com/fJRm4Vk.jpeg) and a [link](https://boot.dev) "
+)
+
+def measure(label, build, count):
+    # Time without tracemalloc, which slows allocation down considerably
+    start = time.perf_counter()
+    nodes = build()
+    elapsed = time.perf_counter() - start
+    del nodes
+    tracemalloc.start()
+    nodes = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:<28} {current / count:8.1f} B/node  {peak / 1e6:8.2f} MB peak  {elapsed * 1e9 / count:8.1f} ns/node")
+    return nodes
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    measure("TextNode", lambda: [TextNode("word", TextType.TEXT) for _ in range(count)], count)
+    text_nodes = [TextNode("word", TextType.BOLD) for _ in range(count)]
+    measure("text_node_to_html_node", lambda: [text_node_to_html_node(node) for node in text_nodes], count)
+    paragraphs = count // 10
+    measure("text_to_children", lambda: [text_to_children(PARAGRAPH) for _ in range(paragraphs)], paragraphs * 10)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+# Deterministic synthetic site for the benchmarks: same seed, same bytes.
+# Run from the repo root to write one out and look at it:
+#   PYTHONPATH=. python3 benchmarks/corpus.py /tmp/corpus --pages 200
+import argparse, os, random
+
+WORDS = (
+    "elf ring hobbit wizard shire mordor river forest mountain song star "
+    "shadow light road king sword council journey tale ancient gate tower "
+    "friend stone silver leaf dwarf horse hall fire memory council dream"
+).split()
+
+TEMPLATE = """<!doctype html>
+<html>
+  <head>
+    <meta charset="utf-8" />
+    <title>{{ Title }}</title>
+    <link href="/index.css" rel="stylesheet" />
+  </head>
+  <body>
+    <article>{{ Content }}</article>
+  </body>
+</html>
+"""
+STYLESHEET = "body {\n  margin: 0 auto;\n  max-width: 800px;\n}\n" * 20
+IMAGE_BYTES = bytes(range(256)) * 16
+IMAGE_URL = "/images/bench.png"
+
+# Relative weight of each block kind; links and images are per sentence
+DEFAULT_DENSITIES = {
+    "paragraphs": 1.0,
+    "lists": 0.3,
+    "code": 0.1,
+    "quotes": 0.1,
+    "headings": 0.2,
+    "links": 0.3,
+    "images": 0.05,
+}
+
+def page_url(rel_dir):
+    return "/" + rel_dir.replace(os.sep, "/")
+
+def make_sentence(rng, urls, densities):
+    words = rng.choices(WORDS, k=rng.randint(6, 16))
+    i = rng.randrange(len(words))
+    words[i] = rng.choice(("**{}**", "_{}_", "`{}`")).format(words[i])
+    if rng.random() < densities["links"]:
+        words.insert(rng.randrange(len(words)), f"[{rng.choice(WORDS)}]({rng.choice(urls)})")
+    if rng.random() < densities["images"]:
+        words.insert(rng.randrange(len(words)), f"![{rng.choice(WORDS)}]({IMAGE_URL})")
+    words[0] = words[0].capitalize()
+    return " ".join(words) + "."
+
+def make_block(rng, kind, urls, densities):
+    if kind == "paragraphs":
+        # Some paragraphs wrap over several lines
+        sentences = [make_sentence(rng, urls, densities) for _ in range(rng.randint(2, 6))]
+        return "\n".join(" ".join(sentences[i:i + 2]) for i in range(0, len(sentences), 2))
+    if kind == "lists":
+        items = [make_sentence(rng, urls, densities) for _ in range(rng.randint(3, 8))]
+        if rng.random() < 0.5:
+            return "\n".join(f"- {item}" for item in items)
+        return "\n".join(f"{i}. {item}" for i, item in enumerate(items, 1))
+    if kind == "code":
+        body = []
+        for _ in range(rng.randint(3, 12)):
+            # Blank lines inside the fence, and indentation to keep
+            body.append("" if rng.random() < 0.1 else "    " * rng.randint(0, 2) + " ".join(rng.choices(WORDS, k=4)))
+        return "```python\n" + "\n".join(body) + "\n```"
+    if kind == "quotes":
+        return "\n".join(f"> {make_sentence(rng, urls, densities)}" for _ in range(rng.randint(1, 4)))
+    return "#" * rng.randint(2, 4) + " " + " ".join(rng.choices(WORDS, k=rng.randint(2, 6))).capitalize()
+
+def make_page(rng, title, urls, densities, blocks_per_page):
+    kinds = ["paragraphs", "lists", "code", "quotes", "headings"]
+    weights = [densities[kind] for kind in kinds]
+    blocks = [f"# {title}"]
+    for kind in rng.choices(kinds, weights, k=max(1, int(rng.gauss(blocks_per_page, blocks_per_page / 4)))):
+        blocks.append(make_block(rng, kind, urls, densities))
+    return "\n\n".join(blocks) + "\n"
+
+def page_dirs(rng, pages, depth, fanout):
+    # Each page gets its own directory, between 0 and depth sections deep
+    dirs = []
+    for i in range(pages):
+        sections = [f"section-{rng.randrange(fanout)}" for _ in range(rng.randint(0, depth))]
+        dirs.append(os.path.join(*sections, f"page-{i}"))
+    return dirs
+
+def generate_corpus(dest_dir, pages=100, seed=0, depth=4, fanout=3, blocks_per_page=30, densities=None):
+    """
+    Write content/, static/ and template.html for a site of `pages` pages
+    under dest_dir. Returns the markdown paths written.
+    """
+    densities = dict(DEFAULT_DENSITIES, **(densities or {}))
+    rng = random.Random(seed)
+    dirs = page_dirs(rng, pages, depth, fanout)
+    urls = [page_url(rel_dir) for rel_dir in dirs]
+    paths = []
+    for i, rel_dir in enumerate(["", *dirs]):
+        title = "Benchmark home" if i == 0 else " ".join(rng.choices(WORDS, k=4)).capitalize()
+        path = os.path.join(dest_dir, "content", rel_dir, "index.md")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(make_page(rng, title, urls, densities, blocks_per_page))
+        paths.append(path)
+    os.makedirs(os.path.join(dest_dir, "static", "images"), exist_ok=True)
+    with open(os.path.join(dest_dir, "static", "index.css"), 'w') as f:
+        f.write(STYLESHEET)
+    with open(os.path.join(dest_dir, "static", IMAGE_URL.lstrip("/")), 'wb') as f:
+        f.write(IMAGE_BYTES)
+    with open(os.path.join(dest_dir, "template.html"), 'w') as f:
+        f.write(TEMPLATE)
+    return paths
+
+def add_corpus_arguments(parser):
+    parser.add_argument("--pages", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--depth", type=int, default=4, help="maximum directory nesting")
+    parser.add_argument("--fanout", type=int, default=3, help="sections per directory level")
+    parser.add_argument("--blocks", type=int, default=30, help="average blocks per page")
+    for name, value in DEFAULT_DENSITIES.items():
+        parser.add_argument(f"--{name}", type=float, default=value, help=f"density of {name} (default {value})")
+
+def corpus_kwargs(args):
+    return {
+        "pages": args.pages,
+        "seed": args.seed,
+        "depth": args.depth,
+        "fanout": args.fanout,
+        "blocks_per_page": args.blocks,
+        "densities": {name: getattr(args, name) for name in DEFAULT_DENSITIES},
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a synthetic site for benchmarking.")
+    parser.add_argument("dest_dir")
+    add_corpus_arguments(parser)
+    args = parser.parse_args()
+    paths = generate_corpus(args.dest_dir, **corpus_kwargs(args))
+    print(f"Wrote {len(paths)} pages to {args.dest_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,6 @@
 #!/bin/bash
 export PYTHONPATH=.
-python3 src/main.py
 
-# Serve the public directory
-cd public && python3 -m http.server 8888
+# Serve content/ directly: pages are rendered on request, cached in memory
+# and the browser reloads on every change. Use build.sh for the real docs/ build.
+python3 -m src.devserver --port 8888
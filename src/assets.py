@@ -0,0 +1,80 @@
+import json, os, re
+from concurrent.futures import ThreadPoolExecutor
+from src.manifest import hash_bytes, hash_file
+from src.sync import AtomicWriter, copy_if_changed
+from src.timings import stage
+from src import log
+from src.utils import find_static_files
+
+# Written into the output tree: site-absolute URL -> fingerprinted URL
+ASSET_MANIFEST_NAME = "asset-manifest.json"
+DIGEST_LENGTH = 8
+FINGERPRINT_PATTERN = re.compile(r"\.[0-9a-f]{%d}\.[^./]+$" % DIGEST_LENGTH)
+
+def fingerprint_name(path, digest):
+    # images/tom.png -> images/tom.3f9a1c2b.png
+    root, ext = os.path.splitext(path)
+    return f"{root}.{digest[:DIGEST_LENGTH]}{ext}"
+
+def is_fingerprinted(path):
+    return FINGERPRINT_PATTERN.search(os.fspath(path)) is not None
+
+def hash_assets(assets):
+    # Pages embed the fingerprinted URLs, so they depend on this map
+    if not assets:
+        return None
+    return hash_bytes(json.dumps(assets, sort_keys=True).encode())
+
+def cached_digest(from_path, digests=None):
+    # digests maps absolute source path -> [size, mtime_ns, inode, digest];
+    # a file whose stat still matches isn't read again
+    if digests is None:
+        return hash_file(from_path)
+    key = os.path.abspath(from_path)
+    stat = os.stat(from_path)
+    signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+    entry = digests.get(key)
+    if entry is not None and entry[:3] == signature:
+        return entry[3]
+    digest = hash_file(from_path)
+    digests[key] = signature + [digest]
+    return digest
+
+def fingerprint_static(source_dir_path, dest_dir_path, hardlink=False, max_workers=None, digests=None):
+    """
+    Copy every static file to a content-hashed name, so the output can be
+    cached forever: a new name appears only when the bytes change.
+    digests, if given, is the cache used by cached_digest; entries for files
+    no longer under source_dir_path are dropped from it.
+    Returns (every output path including the asset manifest, the assets map
+    of site-absolute URL -> fingerprinted URL).
+    """
+    with stage(source_dir_path, "discover"):
+        pairs = find_static_files(source_dir_path, dest_dir_path)
+
+    def copy(pair):
+        from_path, dest_path = pair
+        with stage(from_path, "copy"):
+            hashed_path = fingerprint_name(dest_path, cached_digest(from_path, digests))
+            return hashed_path, copy_if_changed(from_path, hashed_path, hardlink)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(copy, pairs))
+    if digests is not None:
+        source_root = os.path.abspath(source_dir_path) + os.sep
+        current = {os.path.abspath(from_path) for from_path, _ in pairs}
+        for key in [key for key in digests if key.startswith(source_root) and key not in current]:
+            del digests[key]
+    outputs = []
+    assets = {}
+    for (from_path, dest_path), (hashed_path, was_copied) in zip(pairs, results):
+        if was_copied:
+            log.info("static_copy", f" * {from_path} -> {hashed_path}", source=from_path, dest=hashed_path)
+        outputs.append(hashed_path)
+        url = "/" + os.path.relpath(dest_path, dest_dir_path).replace(os.sep, "/")
+        assets[url] = "/" + os.path.relpath(hashed_path, dest_dir_path).replace(os.sep, "/")
+    manifest_path = os.path.join(dest_dir_path, ASSET_MANIFEST_NAME)
+    with AtomicWriter(manifest_path) as manifest_file:
+        json.dump(assets, manifest_file, indent=1, sort_keys=True)
+    outputs.append(manifest_path)
+    return outputs, assets
@@ -0,0 +1,112 @@
+import hashlib, os, pickle
+from collections import OrderedDict
+from src.manifest import hash_generator
+
+class BlockCache:
+    """
+    Size-bounded LRU cache from a markdown block's hash to the node tree it
+    parses into. Nodes are never modified after parsing, so the same tree can
+    be shared by every page that contains the block. Trees are cached rather
+    than HTML strings because URLs are rewritten per basepath at render time.
+    """
+    def __init__(self, max_entries=4096, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        # Entries added since the last drain, kept only when persisting so a
+        # worker can hand them to the parent that saves the cache
+        self.added = {}
+
+    @staticmethod
+    def key(block):
+        return hashlib.blake2b(block.encode(), digest_size=16).digest()
+
+    def get(self, block):
+        key = self.key(block)
+        node = self.entries.get(key)
+        if node is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return node
+
+    def put(self, block, node):
+        if self.max_entries <= 0:
+            return
+        key = self.key(block)
+        self.store(key, node)
+        if self.path is not None:
+            self.added[key] = node
+
+    def store(self, key, node):
+        self.entries[key] = node
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+    def drain(self):
+        # Hand new entries and lookup counts over (e.g. from a worker back to the parent)
+        delta = (self.added, self.hits, self.misses)
+        self.added, self.hits, self.misses = {}, 0, 0
+        return delta
+
+    def merge(self, delta):
+        added, hits, misses = delta
+        for key, node in added.items():
+            self.store(key, node)
+        self.hits += hits
+        self.misses += misses
+
+    @classmethod
+    def load(cls, path, max_entries=4096):
+        cache = cls(max_entries, path)
+        try:
+            with open(path, 'rb') as f:
+                generator_hash, entries = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, ValueError, TypeError, AttributeError):
+            return cache
+        # Parsed trees from a different version of the parser can't be reused
+        if generator_hash == hash_generator():
+            cache.entries = entries
+            while len(cache.entries) > max_entries:
+                cache.entries.popitem(last=False)
+        return cache
+
+    def save(self):
+        if self.path is None:
+            return
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            pickle.dump((hash_generator(), self.entries), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, self.path)
+
+    def summary(self):
+        lookups = self.hits + self.misses
+        rate = 100 * self.hits / lookups if lookups else 0
+        return f"Block cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate), {len(self.entries)} entries"
+
+# Cache used by the page generators in this process, see configure_block_cache
+block_cache = None
+
+def configure_block_cache(max_entries=4096, path=None):
+    global block_cache
+    if max_entries <= 0:
+        block_cache = None
+    elif path is not None:
+        block_cache = BlockCache.load(path, max_entries)
+    else:
+        block_cache = BlockCache(max_entries)
+    return block_cache
+
+def get_block_cache():
+    return block_cache
+
+def block_cache_settings():
+    # Arguments that recreate the current configuration, e.g. in a worker
+    if block_cache is None:
+        return (0, None)
+    return (block_cache.max_entries, block_cache.path)
@@ -0,0 +1,83 @@
+import gzip, json, os
+from concurrent.futures import ThreadPoolExecutor
+from src.manifest import hash_bytes
+from src.sync import AtomicWriter
+from src import log
+
+# Text outputs worth pre-compressing; images are compressed already
+COMPRESSIBLE_EXTENSIONS = (".html", ".css", ".js", ".svg", ".txt", ".xml", ".json")
+GZIP_SUFFIX = ".gz"
+
+def is_compressible(path):
+    return os.fspath(path).endswith(COMPRESSIBLE_EXTENSIONS)
+
+def sidecar_path(path):
+    return os.fspath(path) + GZIP_SUFFIX
+
+def gzip_bytes(data):
+    # mtime=0 and no file name in the header: same input, same bytes
+    return gzip.compress(data, compresslevel=9, mtime=0)
+
+def write_sidecar(path, hashes=None):
+    """
+    Write path + ".gz" next to path. hashes maps output path -> hash of the
+    bytes its sidecar was made from; if it still matches, nothing is done.
+    Returns (sidecar path or None if compressing doesn't make it smaller,
+    whether it was written).
+    """
+    path = os.fspath(path)
+    gz_path = sidecar_path(path)
+    with open(path, 'rb') as f:
+        data = f.read()
+    source_hash = hash_bytes(data)
+    if hashes is not None and hashes.get(path) == source_hash and os.path.exists(gz_path):
+        return gz_path, False
+    compressed = gzip_bytes(data)
+    if len(compressed) >= len(data):
+        if hashes is not None:
+            hashes.pop(path, None)
+        return None, False
+    writer = AtomicWriter(gz_path, 'wb')
+    with writer as gz_file:
+        gz_file.write(compressed)
+    if hashes is not None:
+        hashes[path] = source_hash
+    return gz_path, writer.changed
+
+def load_hashes(path):
+    try:
+        with open(path, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def save_hashes(path, hashes):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(hashes, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+def compress_outputs(paths, cache_path=None, max_workers=None):
+    """
+    Write .gz sidecars for every compressible path, on threads (zlib
+    releases the GIL). With cache_path, outputs whose bytes haven't changed
+    since their sidecar was written are skipped without compressing.
+    Returns the sidecar paths, so they survive orphan removal.
+    """
+    hashes = load_hashes(cache_path) if cache_path else {}
+    paths = [os.fspath(path) for path in paths if is_compressible(path)]
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(lambda path: write_sidecar(path, hashes), paths))
+    sidecars = []
+    for gz_path, written in results:
+        if gz_path is None:
+            continue
+        sidecars.append(gz_path)
+        if written:
+            log.info("gzip", f" * gzip {gz_path}", dest=gz_path)
+    if cache_path:
+        # Forget outputs that are gone
+        kept = set(paths)
+        save_hashes(cache_path, {path: h for path, h in hashes.items() if path in kept})
+    return sidecars
@@ -0,0 +1,160 @@
+import argparse, mimetypes, os, posixpath, shutil, threading, urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from src.template import load_template
+from src.utils import parse_page
+from src.watch import make_watcher
+
+RELOAD_PATH = "/__reload"
+# Injected into every rendered page; reloads the tab when the server says so
+RELOAD_SCRIPT = (
+    '<script>new EventSource("' + RELOAD_PATH + '")'
+    '.onmessage = function () { location.reload(); };</script>'
+)
+
+class DevSite:
+    """
+    Renders content/**/index.md on request and keeps the result in memory
+    until the markdown or the template changes (by mtime).
+    """
+    def __init__(self, dir_path_content, dir_path_static, template_path):
+        self.dir_path_content = os.path.abspath(dir_path_content)
+        self.dir_path_static = os.path.abspath(dir_path_static)
+        self.template_path = os.path.abspath(template_path)
+        self.cache = {}  # markdown path -> ((markdown mtime, template mtime), html bytes)
+        self.lock = threading.Lock()
+        # Bumped on every change so waiting /__reload streams wake up
+        self.generation = 0
+        self.changed = threading.Condition()
+
+    def resolve(self, root, url_path):
+        # Map a URL path to a file under root, refusing anything outside it
+        rel_path = posixpath.normpath(urllib.parse.unquote(url_path)).lstrip("/")
+        path = os.path.abspath(os.path.join(root, rel_path))
+        if path != root and not path.startswith(root + os.sep):
+            return None
+        return path
+
+    def markdown_for(self, url_path):
+        path = self.resolve(self.dir_path_content, url_path)
+        if path is None:
+            return None
+        # /blog/tom, /blog/tom/ and /blog/tom/index.html all mean blog/tom/index.md
+        candidates = [os.path.join(path, "index.md")]
+        if path.endswith(".html"):
+            candidates.append(path[:-len(".html")] + ".md")
+        for candidate in candidates:
+            if os.path.isfile(candidate):
+                return candidate
+        return None
+
+    def render(self, markdown_path):
+        key = (os.stat(markdown_path).st_mtime_ns, os.stat(self.template_path).st_mtime_ns)
+        with self.lock:
+            cached = self.cache.get(markdown_path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        html_node, title = parse_page(markdown_path)
+        html = load_template(self.template_path).render(Title=title, Content=html_node.iter_html())
+        if "</body>" in html:
+            html = html.replace("</body>", RELOAD_SCRIPT + "</body>", 1)
+        else:
+            html += RELOAD_SCRIPT
+        body = html.encode()
+        with self.lock:
+            self.cache[markdown_path] = (key, body)
+        return body
+
+    def notify(self):
+        with self.changed:
+            self.generation += 1
+            self.changed.notify_all()
+
+    def watch(self):
+        watcher = make_watcher([self.dir_path_content, self.dir_path_static], [self.template_path])
+        while True:
+            if watcher.wait():
+                self.notify()
+
+class DevRequestHandler(BaseHTTPRequestHandler):
+    site = None  # set by serve()
+
+    def do_GET(self):
+        url_path = urllib.parse.urlsplit(self.path).path
+        if url_path == RELOAD_PATH:
+            return self.stream_reloads()
+        markdown_path = self.site.markdown_for(url_path)
+        if markdown_path is not None:
+            try:
+                body = self.site.render(markdown_path)
+            except Exception as e:
+                return self.send_error(500, f"Failed to render {markdown_path}: {e}")
+            return self.send_body(body, "text/html; charset=utf-8")
+        static_path = self.site.resolve(self.site.dir_path_static, url_path)
+        if static_path is not None and os.path.isfile(static_path):
+            content_type = mimetypes.guess_type(static_path)[0] or "application/octet-stream"
+            with open(static_path, 'rb') as f:
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(os.fstat(f.fileno()).st_size))
+                self.send_header("Cache-Control", "no-cache")
+                self.end_headers()
+                shutil.copyfileobj(f, self.wfile)
+            return
+        self.send_error(404)
+
+    def send_body(self, body, content_type):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_reloads(self):
+        # Server-Sent Events: one "reload" message per change, forever
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        site = self.site
+        with site.changed:
+            seen = site.generation
+        try:
+            self.wfile.write(b": connected\n\n")
+            self.wfile.flush()
+            while True:
+                with site.changed:
+                    site.changed.wait_for(lambda: site.generation != seen, timeout=15)
+                    current = site.generation
+                if current != seen:
+                    seen = current
+                    self.wfile.write(b"data: reload\n\n")
+                else:
+                    self.wfile.write(b": keep-alive\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+def serve(dir_path_content="./content", dir_path_static="./static", template_path="./template.html", host="127.0.0.1", port=8888):
+    site = DevSite(dir_path_content, dir_path_static, template_path)
+    handler = type("Handler", (DevRequestHandler,), {"site": site})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=site.watch, daemon=True).start()
+    print(f"Serving {dir_path_content} on http://{host}:{port}/ (live reload on)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the site straight from content/, rendering pages on request.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8888)
+    args = parser.parse_args(argv)
+    serve(host=args.host, port=args.port)
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,47 @@
 
+from types import MappingProxyType
+from src.urls import URL_ATTRIBUTES
+
+class FrozenList(list):
+    """A list that can't be modified, so one empty instance can be shared."""
+    __slots__ = ()
+
+    def _immutable(self, *args, **kwargs):
+        raise TypeError("shared empty children list can't be modified")
+
+    append = extend = insert = remove = pop = clear = _immutable
+    sort = reverse = __setitem__ = __delitem__ = __iadd__ = __imul__ = _immutable
+
+# Shared by every node without children/props instead of a new [] and {} each
+EMPTY_CHILDREN = FrozenList()
+EMPTY_PROPS = MappingProxyType({})
+
 class HTMLNode:
+    __slots__ = ("tag", "value", "children", "props")
+
     def __init__(self, tag=None, value=None, children=None, props=None):
         self.tag = tag
         self.value = value
-        self.children = [] if children is None else children #if children is not None else []
-        self.props = {} if props is None else props #if props is not None else {}
+        self.children = EMPTY_CHILDREN if children is None else children #if children is not None else []
+        self.props = EMPTY_PROPS if props is None else props #if props is not None else {}
 
-    def to_html(self):
+    def __reduce__(self):
+        # The shared empty children/props aren't picklable, so store plain
+        # values and rebuild the node through HTMLNode.__init__
+        children = list(self.children) if self.children else None
+        props = dict(self.props) if self.props else None
+        return (_restore_node, (type(self), self.tag, self.value, children, props))
+
+    def to_html(self, rewrite_url=None):
+        return "".join(self.iter_html(rewrite_url))
+
+    def write_html(self, fp, rewrite_url=None):
+        # Stream the rendered chunks straight into fp without building the page
+        fp.writelines(self.iter_html(rewrite_url))
+
+    def iter_html(self, rewrite_url=None):
+        # rewrite_url, if given, is applied to href/src props as they render
+        raise NotImplementedError("iter_html must be implemented by subclasses")
         """# Handle children
         children_html = "".join(child.to_html() for child in self.children if child is not None) if self.children else ""
 
@@ -23,11 +58,13 @@ class HTMLNode:
         # Default case for generic tags
         return f"<{self.tag}>{children_html}</{self.tag}>"""
 
-    def props_to_html(self):
+    def props_to_html(self, rewrite_url=None):
         emptylist = [] # Prepare an empty list to collect HTML attributes
         if self.props is None: # Handle the case where `props` is None
             return ""
         for key, value in self.props.items(): # Loop through each key-value pair in props
+            if rewrite_url is not None and key in URL_ATTRIBUTES:
+                value = rewrite_url(value)
             emptylist.append(f' {key}="{value}"') # Add the formatted string to the list
         return "".join(emptylist) # Join the list elements into a single string
     
@@ -42,21 +79,29 @@ class HTMLNode:
         )
         return f"HTMLNode(tag={self.tag}, value={self.value}, children={children_repr}, props={props_repr})"
     
+def _restore_node(cls, tag, value, children, props):
+    node = cls.__new__(cls)
+    HTMLNode.__init__(node, tag, value, children, props)
+    return node
+
 class LeafNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, value, props=None):
     # Call parent constructor with empty children list
         super().__init__(tag, value, None, props)
 
-    def to_html(self):
+    def iter_html(self, rewrite_url=None):
         # Check if value exists
         if self.value is None:
             raise ValueError("invalid HTML: no value")
         # If no tag, return raw text
         if self.tag is None:
-            return self.value
+            yield self.value
+            return
         """props_str = self.props_to_html()
         return f"<{self.tag}{props_str}>{self.value}</{self.tag}>" """
-        return f"<{self.tag}{self.props_to_html()}>{self.value}</{self.tag}>"
+        yield f"<{self.tag}{self.props_to_html(rewrite_url)}>{self.value}</{self.tag}>"
         # Otherwise, return formatted HTML
 
     def __repr__(self):
@@ -71,20 +116,22 @@ class LeafNode(HTMLNode):
             return f"<{self.tag}>{self.value}</{self.tag}>" """
 
 class ParentNode(HTMLNode):
+    __slots__ = ()
+
     def __init__(self, tag, children, props=None):
-        if props is None:
-            props = {}
         super().__init__(tag, None, children, props)
     
-    def to_html(self):
+    def iter_html(self, rewrite_url=None):
         if self.tag is None:
             raise  ValueError("invalid HTML: no tag")
         if self.children is None:
             raise  ValueError("invalid HTML: no children")
-        children_html = ""
+        # Yield tags and children as separate chunks instead of concatenating,
+        # so the cost stays linear in the size of the page
+        yield f"<{self.tag}{self.props_to_html(rewrite_url)}>"
         for child in self.children:
-            children_html += child.to_html()
-        return f"<{self.tag}{self.props_to_html()}>{children_html}</{self.tag}>"
+            yield from child.iter_html(rewrite_url)
+        yield f"</{self.tag}>"
 
         """# Start building the HTML string with the opening tag
         html = f"<{self.tag}"
@@ -1,13 +1,12 @@
-import re
+from src.patterns import REGEX
 from src.textnode import TextNode, TextType
 
 def extract_markdown_images(text):
     # Matches valid Markdown images
     #pattern = r"(?:^|\s)!\[([^\[\]\n]+)\]\((https?://[^\s\(\)]+\.[^\s\(\)]+)\)(?=\s|$)"
     #pattern = r'!\[([^\[\]\n]*)\]\((https?://[^\s\(\)]+(?:\.[a-zA-Z]{2,})(?:[^\s\(\)]*)?)\)'
-    pattern = r"!\[([^\[\]]*)\]\(([^\(\)]*)\)"
     #pattern = r"!\[((?:[^\[\]]|\[[^\[\]]*\])*)\]\(([^()]*(?:\([^()]*\)[^()]*)*)\)"
-    matches = re.findall(pattern, text)
+    matches = REGEX.image.findall(text)
     valid_matches = []
     for match in matches:
         if not match[0] or not match[1]:  # Check alt text and URL
@@ -19,8 +18,7 @@ def extract_markdown_links(text):
     #pattern = r"\[([^\[\]]*(?:\[[^\[\]]*\][^\[\]]*)*?)\]\((https?://[^\s\)]+)\)"
     #pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
     #pattern = r"(?<!!)\[((?:\\.|[^\[\]])*)\]\(((?:\\.|[^\(\)])*)\)"
-    pattern = r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)"
-    matches = re.findall(pattern, text)
+    matches = REGEX.link.findall(text)
     valid_matches = []
     for match in matches:
         if not match[0] or not match[1]:  # Check if either alt text or URL is missing
@@ -91,33 +89,7 @@ def split_nodes_image(old_nodes):
         # Add any remaining text after the last image (if not empty)
             new_nodes.append(TextNode(remaining_text, TextType.TEXT))
     return new_nodes"""
-    new_nodes = []
-    for old_node in old_nodes:
-        if old_node.text_type != TextType.TEXT:
-            new_nodes.append(old_node)
-            continue
-        original_text = old_node.text
-        images = extract_markdown_images(original_text)
-        if len(images) == 0:
-            new_nodes.append(old_node)
-            continue
-        for image in images:
-            sections = original_text.split(f"![{image[0]}]({image[1]})", 1)
-            if len(sections) != 2:
-                raise ValueError("invalid markdown, image section not closed")
-            if sections[0] != "":
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            new_nodes.append(
-                TextNode(
-                    image[0],
-                    TextType.IMAGE,
-                    image[1],
-                )
-            )
-            original_text = sections[1]
-        if original_text != "":
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
-    return new_nodes
+    return split_nodes_pattern(old_nodes, REGEX.image, TextType.IMAGE, "image")
 
 def split_nodes_link(old_nodes):
     """
@@ -143,54 +115,73 @@ def split_nodes_link(old_nodes):
                 remaining_text = ""
         new_nodes.append(TextNode(remaining_text, TextType.TEXT))
     return new_nodes   """
+    return split_nodes_pattern(old_nodes, REGEX.link, TextType.LINK, "link")
+
+def split_nodes_pattern(old_nodes, pattern, text_type, kind):
+    # Slice around each match's span instead of re-searching the remaining
+    # text for a rebuilt copy of the markdown, which keeps this linear in the
+    # number of matches
     new_nodes = []
     for old_node in old_nodes:
         if old_node.text_type != TextType.TEXT:
             new_nodes.append(old_node)
             continue
         original_text = old_node.text
-        links = extract_markdown_links(original_text)
-        if not links:
+        text_start = 0
+        for match in pattern.finditer(original_text):
+            label, url = match.groups()
+            if not label or not url:
+                raise ValueError(f"Malformed {kind} markdown found: missing alt text or URL.")
+            match_start, match_end = match.span()
+            if match_start > text_start:
+                new_nodes.append(TextNode(original_text[text_start:match_start], TextType.TEXT))
+            new_nodes.append(TextNode(label, text_type, url))
+            text_start = match_end
+        if text_start == 0:
             new_nodes.append(old_node)
-            continue
-        for link in links:
-            sections = original_text.split(f"[{link[0]}]({link[1]})", 1)
-            if len(sections) != 2:
-                raise ValueError("Invalid markdown, link section not closed")
-            
-            # Add text section before the link, including leading/trailing whitespace
-            if sections[0]:
-                new_nodes.append(TextNode(sections[0], TextType.TEXT))
-            
-            # Add the link node
-            new_nodes.append(TextNode(link[0], TextType.LINK, link[1]))
-            
-            # Update original_text for the remaining part after the link
-            original_text = sections[1]
-        
-        # Add remaining text after the last link, including leading/trailing whitespace
-        if original_text:
-            new_nodes.append(TextNode(original_text, TextType.TEXT))
-    
+        elif text_start < len(original_text):
+            new_nodes.append(TextNode(original_text[text_start:], TextType.TEXT))
     return new_nodes
 
+INLINE_DELIMITERS = {
+    "bold": TextType.BOLD,
+    "italic": TextType.ITALIC,
+    "code": TextType.CODE,
+}
+
 def text_to_textnodes(text):
-    ###print(f"Processing text: {text}")
     # Step 1: Validate input (to catch improper types, as we discussed)
     if not isinstance(text, str):
         raise TypeError(f"Expected string input, got {type(text)} instead.")
 
-    # Step 2: Start with a single text node
-    nodes = [TextNode(text, TextType.TEXT)]
-
-    # Step 3: Process bold, italic, and code using existing functions
-    nodes = split_nodes_delimiter(nodes, "_", TextType.ITALIC)
-    nodes = split_nodes_delimiter(nodes, "**", TextType.BOLD)
-    nodes = split_nodes_delimiter(nodes, "`", TextType.CODE)
-    nodes = split_nodes_image(nodes)
-    nodes = split_nodes_link(nodes)
-    #nodes = [node for node in nodes if node.text != ""]
-    ###print(f"Generated text nodes: {nodes}")
+    # Step 2: Walk every inline construct in a single pass
+    nodes = []
+    text_start = 0  # start of the plain text not yet emitted
+    for match in REGEX.inline.finditer(text):
+        kind = match.lastgroup
+        if kind == "unclosed":
+            raise ValueError("Invalid markdown: formatted section not closed.")
+        match_start = match.start()
+        if match_start > text_start:
+            nodes.append(TextNode(text[text_start:match_start], TextType.TEXT))
+        text_start = match.end()
+        if kind in INLINE_DELIMITERS:
+            content = match.group(kind)
+            if content:
+                nodes.append(TextNode(content, INLINE_DELIMITERS[kind]))
+        elif kind == "src":
+            alt, src = match.group("alt", "src")
+            if not alt or not src:
+                raise ValueError("Malformed image markdown found: missing alt text or URL.")
+            nodes.append(TextNode(alt, TextType.IMAGE, src))
+        else:
+            anchor, href = match.group("anchor", "href")
+            if not anchor or not href:
+                raise ValueError("Malformed link markdown found: missing alt text or URL.")
+            nodes.append(TextNode(anchor, TextType.LINK, href))
+
+    if text_start < len(text):
+        nodes.append(TextNode(text[text_start:], TextType.TEXT))
     return nodes
 
 """def ensure_valid_nodes(nodes):
@@ -201,31 +192,74 @@ def text_to_textnodes(text):
     assert all(isinstance(node, TextNode) for node in nodes), "Nodes list contains invalid items!"
 """
 
-def markdown_to_blocks(markdown):
-    # Strip global whitespace/newlines on the input Markdown string
-    markdown = markdown.strip()
-    # Split by double newlines into blocks
-    blocks = markdown.split('\n\n')
-    new_blocks = []
-    for block in blocks:
-        # Clean lines individually inside the block
-        cleaned_lines = [line.strip() for line in block.splitlines()]
-        # Rejoin cleaned lines and then strip the entire block
-        cleaned_block = '\n'.join(cleaned_lines).strip()
-        # Add cleaned block only if it's not empty
-        if cleaned_block:
-            new_blocks.append(cleaned_block)
-    return new_blocks
-# Split the markdown into blocks divided by two newline characters
-    blocks = markdown.split("\n\n")
-    filtered_blocks = []
-    for block in blocks:
-        if block == "":
+FENCE = "```"
+
+def iter_lines(text):
+    # Lines of text with their newlines, without building a list of them
+    start = 0
+    while start < len(text):
+        end = text.find("\n", start)
+        if end == -1:
+            yield text[start:]
+            return
+        yield text[start:end + 1]
+        start = end + 1
+
+def is_fence(stripped_line):
+    # ```python opens or closes a fence; ```code``` on one line does neither
+    return stripped_line.startswith(FENCE) and stripped_line.count(FENCE) == 1
+
+def scan_blocks(lines):
+    """
+    Single pass over lines (a file object works) yielding (start, end, block)
+    for every block: start/end are character offsets of the block in the
+    source, from its first to just past its last non-whitespace character,
+    and block is its text with each line stripped.
+    Blank lines end a block, except inside a ``` fence: a fence is one block
+    up to its closing ``` (or the end of the input), blank lines included,
+    and its content lines keep their indentation relative to the fence.
+    """
+    offset = 0
+    block_lines = []
+    start = end = 0
+    fence_indent = None  # indentation of the open fence, None outside one
+    for line in lines:
+        line_start = offset
+        offset += len(line)
+        content = line.rstrip("\r\n")
+        stripped = content.strip()
+        if fence_indent is not None:
+            if is_fence(stripped):
+                block_lines.append(stripped)
+                fence_indent = None
+            else:
+                # Drop up to the fence's own indentation, keep the rest
+                indent = len(content) - len(content.lstrip())
+                block_lines.append(content[min(indent, fence_indent):].rstrip())
+            if stripped:
+                end = line_start + len(content.rstrip())
+            continue
+        if not stripped:
+            if block_lines:
+                yield start, end, "\n".join(block_lines)
+                block_lines = []
             continue
-        # Clean each line inside the block to handle inconsistent indentation
-        lines = block.splitlines()
-        cleaned_lines = [line.strip() for line in lines]  # Strip each line
-        reconstructed_block = "\n".join(cleaned_lines)  # Rejoin cleaned lines
-        # Add the cleaned block only if it's not empty
-        filtered_blocks.append(reconstructed_block)
-    return filtered_blocks
+        indent = len(content) - len(content.lstrip())
+        if not block_lines:
+            start = line_start + indent
+        block_lines.append(stripped)
+        end = line_start + len(content.rstrip())
+        if is_fence(stripped):
+            fence_indent = indent
+    if block_lines:
+        yield start, end, "\n".join(block_lines)
+
+def iter_blocks(markdown):
+    # markdown is a string or any iterable of lines, such as an open file
+    if isinstance(markdown, str):
+        markdown = iter_lines(markdown)
+    for _, _, block in scan_blocks(markdown):
+        yield block
+
+def markdown_to_blocks(markdown):
+    return list(iter_blocks(markdown))
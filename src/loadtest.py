@@ -0,0 +1,87 @@
+import argparse, asyncio, json, time, urllib.parse
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ", 2)[1])
+    length = 0
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name.strip().lower() == "content-length":
+            length = int(value)
+    if length:
+        await reader.readexactly(length)
+    return status
+
+async def run_connection(host, port, paths, deadline, latencies, errors, index):
+    # One keep-alive connection sending requests back to back until deadline
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while time.perf_counter() < deadline:
+            path = paths[index % len(paths)]
+            index += 1
+            request = f"GET {path} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode()
+            start = time.perf_counter()
+            writer.write(request)
+            try:
+                status = await read_response(reader)
+            except (asyncio.IncompleteReadError, ConnectionError):
+                errors.append("connection closed")
+                break
+            latencies.append(time.perf_counter() - start)
+            if status >= 400:
+                errors.append(status)
+    finally:
+        writer.close()
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    index = min(int(fraction * len(sorted_values)), len(sorted_values) - 1)
+    return sorted_values[index]
+
+async def load_test(url, paths, connections, duration):
+    parts = urllib.parse.urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+    paths = paths or [parts.path or "/"]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*[
+        run_connection(host, port, paths, deadline, latencies, errors, i)
+        for i in range(connections)
+    ])
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": elapsed,
+        "requests_per_second": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 0.50) * 1000,
+        "p90_ms": percentile(latencies, 0.90) * 1000,
+        "p99_ms": percentile(latencies, 0.99) * 1000,
+        "max_ms": (latencies[-1] if latencies else 0) * 1000,
+    }
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep-alive HTTP load test against a local server.")
+    parser.add_argument("url", help="e.g. http://127.0.0.1:8000/")
+    parser.add_argument("paths", nargs="*", help="paths to cycle through (default: the URL's path)")
+    parser.add_argument("-c", "--connections", type=int, default=32)
+    parser.add_argument("-d", "--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument("--json", action="store_true", help="print the results as JSON")
+    args = parser.parse_args(argv)
+    results = asyncio.run(load_test(args.url, args.paths, args.connections, args.duration))
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{results['requests']} requests in {results['seconds']:.2f}s, {results['errors']} errors")
+    print(f"{results['requests_per_second']:.0f} requests/sec")
+    print(
+        f"latency p50 {results['p50_ms']:.2f} ms, p90 {results['p90_ms']:.2f} ms, "
+        f"p99 {results['p99_ms']:.2f} ms, max {results['max_ms']:.2f} ms"
+    )
+
+if __name__ == "__main__":
+    main()
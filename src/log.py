@@ -0,0 +1,95 @@
+import json, sys, time
+
+DEBUG, INFO, WARNING, ERROR = 10, 20, 30, 40
+LEVELS = {"debug": DEBUG, "info": INFO, "warning": WARNING, "error": ERROR}
+LEVEL_NAMES = {value: name for name, value in LEVELS.items()}
+# "summary": warnings, errors and reports (counts and durations) only
+# "verbose": every event at or above the level, e.g. one line per file
+# "quiet": warnings and errors only
+MODES = ("summary", "verbose", "quiet")
+
+class BuildLog:
+    """
+    Build events with a kind ("page", "static_copy", ...), a level and a
+    message. Every event is counted, so a summary can report totals without
+    printing a line per file; events at or above the level also go to the
+    JSON-lines sink, if there is one, with their extra fields.
+    """
+    def __init__(self, level=INFO, mode="summary", json_path=None, stream=None):
+        self.level = level
+        self.mode = mode
+        self.stream = stream
+        self.counts = {}
+        self.started = time.perf_counter()
+        self.json_file = open(json_path, 'w') if json_path else None
+
+    def event(self, level, kind, message, **fields):
+        self.counts[kind] = self.counts.get(kind, 0) + 1
+        if level < self.level and level < WARNING:
+            return
+        if self.json_file is not None:
+            self.write_json(LEVEL_NAMES[level], kind, message, fields)
+        if level >= WARNING:
+            print(message, file=self.stream or sys.stderr)
+        elif self.mode == "verbose":
+            print(message, file=self.stream or sys.stdout)
+
+    def report(self, message, **fields):
+        # Summaries the user asked for (or the default build summary)
+        if self.json_file is not None:
+            self.write_json("info", "report", message, fields)
+        if self.mode != "quiet":
+            print(message, file=self.stream or sys.stdout)
+
+    def write_json(self, level_name, kind, message, fields):
+        record = {"time": time.time(), "level": level_name, "event": kind, "message": message}
+        record.update(fields)
+        self.json_file.write(json.dumps(record, default=str) + "\n")
+
+    def count(self, kind):
+        return self.counts.get(kind, 0)
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def close(self):
+        if self.json_file is not None:
+            self.json_file.close()
+            self.json_file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        # A build that dies still leaves a complete JSON-lines file, ending
+        # with the error
+        if exc_type is not None and issubclass(exc_type, Exception):
+            self.event(ERROR, "build_failed", f"Build failed: {exc}", error=repr(exc))
+        self.close()
+
+# Log used by the build in this process, see configure_logging
+build_log = BuildLog()
+
+def configure_logging(level="info", mode="summary", json_path=None):
+    global build_log
+    build_log.close()
+    build_log = BuildLog(LEVELS[level], mode, json_path)
+    return build_log
+
+def get_log():
+    return build_log
+
+def debug(kind, message, **fields):
+    build_log.event(DEBUG, kind, message, **fields)
+
+def info(kind, message, **fields):
+    build_log.event(INFO, kind, message, **fields)
+
+def warning(kind, message, **fields):
+    build_log.event(WARNING, kind, message, **fields)
+
+def error(kind, message, **fields):
+    build_log.event(ERROR, kind, message, **fields)
+
+def report(message, **fields):
+    build_log.report(message, **fields)
@@ -1,55 +1,235 @@
 #print("hello world")
 #from src.htmlnode import HTMLNode, LeafNode, ParentNode
 #from src.textnode import TextNode, TextType
-import os, shutil, sys
+import argparse, cProfile, io, os, pstats, shutil
 #print("Current working directory:", os.getcwd())
 #print(os.path.exists("/root/workspace/github.com/Vyboloten/Sstatick/src/utils.py"))
-from src.utils import copy_files_recursive, generate_pages_recursive
+from src.utils import copy_files_recursive, generate_site
+from src.manifest import BuildManifest, manifest_path_for
+from src.block_cache import configure_block_cache
+from src.sync import KEEP_PATTERNS, remove_orphans
+from src.compress import compress_outputs, load_hashes, save_hashes
+from src.assets import fingerprint_static, hash_assets
+from src.patterns import REGEX
+from src.timings import configure_timings
+from src.memory import configure_memory_report
+from src.log import LEVELS, configure_logging
+from src import log
+from src.watch import watch_site
 
 dir_path_static = "./static"
 dir_path_public = "./public"
 dir_path_content = "./content"
 template_path = "./template.html"
 dir_path_docs = "./docs"
+dir_path_cache = "./.cache"
+block_cache_path = os.path.join(dir_path_cache, "blocks.pickle")
+gzip_cache_path = os.path.join(dir_path_cache, "gzip.json")
+static_digests_path = os.path.join(dir_path_cache, "static-digests.json")
 
-basepath = sys.argv[1] if len(sys.argv) > 1 else "/"
+def parse_variant(value):
+    basepath, sep, dest_dir = value.partition("=")
+    if not sep or not basepath or not dest_dir:
+        raise argparse.ArgumentTypeError(f"expected BASEPATH=DIR, got {value!r}")
+    return basepath, dest_dir
 
-def main():
-    # First delete public if it exists
-    if os.path.exists(dir_path_docs):
-        shutil.rmtree(dir_path_docs)
-        print("Deleted existing docs directory.")
-    # Then call your function with static as source and public as destination
-    #copy_static('static', 'public')
-     # Create markdown files
-    #create_index_md()
-    #create_markdown_files()
-    #copy_images ()
-    print("Copying static files to docs directory...")
-    copy_files_recursive(dir_path_static, dir_path_docs)
-    print("Generating content...")
-    generate_pages_recursive(dir_path_content, template_path, dir_path_docs, basepath)
-    # Generate HTML pages for all markdown files
-    """for root, dirs, files in os.walk("content"):
-        for file in files:
-            if file.endswith(".md"):
-                markdown_path = os.path.join(root, file)
-                # Determine the output path
-                rel_path = os.path.relpath(markdown_path, "content")
-                output_path = os.path.join("public", os.path.splitext(rel_path)[0] + ".html")
-                
-                # Create the directory if it doesn't exist
-                os.makedirs(os.path.dirname(output_path), exist_ok=True)
-                
-                # Generate the HTML page
-                generate_page(markdown_path, "template.html", output_path)
-                print(f"Generated HTML page at {output_path}")"
-                """
-    
-
-        
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Build the site from content/ into docs/.")
+    parser.add_argument("basepath", nargs="?", help="URL prefix the site is served under (default /)")
+    parser.add_argument("-j", "--jobs", type=int, default=1, help="number of worker processes for page generation")
+    parser.add_argument(
+        "--variant", action="append", type=parse_variant, metavar="BASEPATH=DIR",
+        help="also build the site for BASEPATH into DIR (repeatable); replaces the default docs/ build",
+    )
+    parser.add_argument(
+        "--block-cache-size", type=int, default=4096, metavar="N",
+        help="number of parsed blocks kept in the LRU block cache (0 disables it)",
+    )
+    parser.add_argument(
+        "--persist-block-cache", action="store_true",
+        help="keep the block cache in .cache/ between builds",
+    )
+    parser.add_argument(
+        "--hardlink-static", action="store_true",
+        help="hardlink static files into the output instead of copying them",
+    )
+    parser.add_argument(
+        "--fingerprint", action="store_true",
+        help="copy static files to content-hashed names (index.3f9a1c2b.css) and point pages at them",
+    )
+    parser.add_argument(
+        "--gzip", action="store_true",
+        help="write precompressed .gz sidecars next to HTML, CSS and other text outputs",
+    )
+    parser.add_argument(
+        "--regex-stats", action="store_true",
+        help="count calls and time spent in each parsing regex and print them after the build",
+    )
+    parser.add_argument(
+        "--timings", action="store_true",
+        help="time each build stage (parse, to_html, template, write, copy) and print the totals and slowest pages",
+    )
+    parser.add_argument(
+        "--trace", metavar="PATH",
+        help="write a Chrome/Perfetto trace-event JSON of the build stages to PATH",
+    )
+    parser.add_argument(
+        "--memory-report", action="store_true",
+        help="trace allocations and node counts while parsing and rendering each page and list the biggest",
+    )
+    parser.add_argument(
+        "--profile", metavar="PATH",
+        help="run the build under cProfile and dump the stats to PATH",
+    )
+    verbosity = parser.add_mutually_exclusive_group()
+    verbosity.add_argument(
+        "-v", "--verbose", action="store_true",
+        help="print every event (one line per page and static file) instead of a summary",
+    )
+    verbosity.add_argument(
+        "-q", "--quiet", action="store_true",
+        help="print only warnings and errors",
+    )
+    parser.add_argument(
+        "--log-level", choices=LEVELS, default="info",
+        help="lowest level printed with --verbose and written to --log-json (default info)",
+    )
+    parser.add_argument(
+        "--log-json", metavar="PATH",
+        help="also write every event as a JSON line to PATH, e.g. for CI",
+    )
+    parser.add_argument(
+        "--watch", action="store_true",
+        help="after building, keep watching content/, static/ and the template and rebuild what changes",
+    )
+    parser.add_argument(
+        "--keep", action="append", default=[], metavar="GLOB",
+        help="never delete output files matching GLOB, in addition to dotfiles and CNAME (repeatable)",
+    )
+    parser.add_argument(
+        "--clean", action="store_true",
+        help="delete the output directory first instead of syncing changes into it",
+    )
+    args = parser.parse_args(argv)
+    # --variant replaces the default build, so a basepath for it would be ignored
+    if args.variant and args.basepath is not None:
+        parser.error("basepath can't be combined with --variant; add it as another --variant")
+    if args.basepath is None:
+        args.basepath = "/"
+    return args
 
+def main(argv=None):
+    args = parse_args(argv)
+    # Closed (and a failure logged) however the build ends
+    with configure_logging(
+        args.log_level,
+        "verbose" if args.verbose else "quiet" if args.quiet else "summary",
+        args.log_json,
+    ) as build_log:
+        build(args, build_log)
 
+def build(args, build_log):
+    block_cache = configure_block_cache(
+        args.block_cache_size,
+        block_cache_path if args.persist_block_cache else None,
+    )
+    timer = configure_timings(args.timings or args.trace is not None)
+    if args.regex_stats:
+        REGEX.enable_stats()
+    # Counters and the profiler live in this process, so don't hand pages to workers
+    if (args.regex_stats or args.profile or args.memory_report) and args.jobs > 1:
+        log.warning("jobs", "--regex-stats, --profile and --memory-report build with -j 1")
+        args.jobs = 1
+    memory_report = configure_memory_report(args.memory_report)
+    profiler = None
+    if args.profile:
+        profiler = cProfile.Profile()
+        profiler.enable()
+    # Every variant reuses the same parse of each page
+    variants = args.variant or [(args.basepath, dir_path_docs)]
+    targets = []
+    outputs = []
+    assets = None
+    # Static file digests for --fingerprint, reused while size/mtime/inode match
+    static_digests = load_hashes(static_digests_path) if args.fingerprint else None
+    for basepath, dest_dir in variants:
+        # Stale files get deleted from the output, so it must not hold the sources
+        if os.path.commonpath([os.path.abspath(dest_dir), os.path.abspath(dir_path_content)]) == os.path.abspath(dest_dir):
+            raise Exception(f"Output directory {dest_dir} must not contain {dir_path_content}")
+        # Normally the existing tree is updated in place; --clean starts over
+        if args.clean and os.path.exists(dest_dir):
+            shutil.rmtree(dest_dir)
+            log.info("progress", f"Deleted existing {dest_dir} directory.", dest=dest_dir)
+        log.info("progress", f"Copying static files to {dest_dir} directory...", dest=dest_dir)
+        if args.fingerprint:
+            static_outputs, assets = fingerprint_static(
+                dir_path_static, dest_dir, args.hardlink_static, digests=static_digests,
+            )
+        else:
+            static_outputs = copy_files_recursive(dir_path_static, dest_dir, args.hardlink_static)
+        outputs.extend(static_outputs)
+        # Loaded after the copy: pages embed the fingerprinted names
+        manifest = BuildManifest.load(
+            manifest_path_for(dir_path_cache, dest_dir), template_path, basepath, hash_assets(assets),
+        )
+        targets.append((dest_dir, basepath, manifest))
+    if static_digests is not None:
+        save_hashes(static_digests_path, static_digests)
+    log.info("progress", "Generating content...")
+    page_outputs, failures = generate_site(dir_path_content, template_path, targets, args.jobs, assets)
+    outputs.extend(page_outputs)
+    if args.gzip:
+        log.info("progress", "Compressing text outputs...")
+        outputs.extend(compress_outputs(outputs, gzip_cache_path))
+    # Saved even if some pages failed, so the next build only retries those
+    for dest_dir, _, manifest in targets:
+        manifest.prune()
+        manifest.save()
+        # Anything in the output that this build didn't produce is stale
+        for path in remove_orphans(dest_dir, outputs, KEEP_PATTERNS + tuple(args.keep)):
+            log.info("removed", f"Removed stale file {path}", dest=path)
+    if block_cache is not None:
+        # Under -j this includes what the workers parsed and looked up
+        block_cache.save()
+        if block_cache.hits or block_cache.misses:
+            log.report(block_cache.summary(), hits=block_cache.hits, misses=block_cache.misses)
+    summary = (
+        f"Built {build_log.count('page')} page(s) ({build_log.count('page_skipped')} up to date), "
+        f"copied {build_log.count('static_copy')} static file(s), "
+    )
+    if args.gzip:
+        summary += f"wrote {build_log.count('gzip')} gzip sidecar(s), "
+    summary += f"removed {build_log.count('removed')} stale file(s) in {build_log.elapsed() * 1000:.0f} ms"
+    log.report(summary, **{kind: build_log.count(kind) for kind in ("page", "page_skipped", "static_copy", "gzip", "removed")})
+    if args.regex_stats:
+        log.report(REGEX.summary())
+    if args.timings:
+        log.report(timer.summary())
+    if args.trace:
+        timer.write_trace(args.trace)
+        log.report(f"Wrote trace to {args.trace} (open it in chrome://tracing or ui.perfetto.dev)")
+    if memory_report is not None:
+        log.report(memory_report.summary())
+        configure_memory_report(False)
+    if profiler is not None:
+        profiler.disable()
+        profiler.dump_stats(args.profile)
+        log.report(f"Wrote cProfile stats to {args.profile}")
+        stats_text = io.StringIO()
+        pstats.Stats(profiler, stream=stats_text).sort_stats("cumulative").print_stats(15)
+        log.report(stats_text.getvalue().rstrip())
+    if failures:
+        log.error("build_failed", f"{len(failures)} page(s) failed to generate", failed=len(failures))
+        raise SystemExit(1)
+    if args.watch:
+        watch_site(
+            dir_path_content, dir_path_static, template_path,
+            [(dest_dir, basepath) for basepath, dest_dir in variants],
+            compress=args.gzip,
+            fingerprint=args.fingerprint,
+            assets=assets,
+            digests=static_digests,
+        )
 
 # Call the main function
 if __name__ == "__main__":
@@ -0,0 +1,100 @@
+import hashlib, json, os, re
+
+MANIFEST_VERSION = 1
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+def hash_file(path):
+    # Read in chunks so large sources don't have to sit in memory twice
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 16), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def hash_generator():
+    # Output also depends on the parser/renderer code itself, so a change to
+    # any module in src/ has to invalidate every page
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(SRC_DIR)):
+        if filename.endswith(".py") and not filename.startswith("test_"):
+            with open(os.path.join(SRC_DIR, filename), 'rb') as f:
+                digest.update(filename.encode())
+                digest.update(f.read())
+    return digest.hexdigest()
+
+def manifest_path_for(cache_dir, dest_dir):
+    # One manifest per output tree, e.g. ./docs -> .cache/manifest-docs.json
+    name = re.sub(r"[^A-Za-z0-9]+", "_", os.path.normpath(dest_dir)).strip("_")
+    return os.path.join(cache_dir, f"manifest-{name}.json")
+
+class BuildManifest:
+    """
+    Records what every generated page was built from, so the next build can
+    skip pages whose markdown, template, basepath, fingerprinted assets and
+    generator are unchanged.
+    """
+    def __init__(self, path, template_hash, basepath, generator_hash=None, pages=None, assets_hash=None):
+        self.path = path
+        self.template_hash = template_hash
+        self.basepath = basepath
+        self.generator_hash = generator_hash
+        self.assets_hash = assets_hash
+        self.pages = {} if pages is None else pages  # dest path -> source hash
+        self.seen = set()
+
+    @classmethod
+    def load(cls, path, template_path, basepath, assets_hash=None):
+        template_hash = hash_file(template_path)
+        generator_hash = hash_generator()
+        manifest = cls(path, template_hash, basepath, generator_hash, assets_hash=assets_hash)
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return manifest
+        # Anything global changed: every page is stale
+        if (
+            data.get("version") != MANIFEST_VERSION or
+            data.get("template") != template_hash or
+            data.get("basepath") != basepath or
+            data.get("generator") != generator_hash or
+            data.get("assets") != assets_hash
+        ):
+            return manifest
+        manifest.pages = data.get("pages", {})
+        return manifest
+
+    def is_fresh(self, dest_path, source_hash):
+        dest_path = str(dest_path)
+        self.seen.add(dest_path)
+        return self.pages.get(dest_path) == source_hash and os.path.exists(dest_path)
+
+    def record(self, dest_path, source_hash):
+        dest_path = str(dest_path)
+        self.seen.add(dest_path)
+        self.pages[dest_path] = source_hash
+
+    def prune(self):
+        # Pages built last time whose markdown no longer exists
+        stale = [dest for dest in self.pages if dest not in self.seen]
+        for dest in stale:
+            del self.pages[dest]
+        return stale
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        data = {
+            "version": MANIFEST_VERSION,
+            "template": self.template_hash,
+            "basepath": self.basepath,
+            "generator": self.generator_hash,
+            "assets": self.assets_hash,
+            "pages": self.pages,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
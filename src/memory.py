@@ -0,0 +1,100 @@
+import contextlib, functools, os, tracemalloc
+try:
+    import resource
+except ImportError:  # not available on Windows
+    resource = None
+from src.htmlnode import HTMLNode
+from src.textnode import TextNode
+
+# Classes whose constructions are counted while a report is running
+COUNTED_CLASSES = (TextNode, HTMLNode)
+
+class MemoryReport:
+    """
+    Per-stage allocation accounting for --memory-report. While running,
+    tracemalloc is on and TextNode/HTMLNode __init__ are wrapped to count
+    constructions; both cost enough that they stay off in normal builds.
+    Each measurement is (peak bytes above the stage's starting point, stage,
+    item, TextNodes created, HTMLNodes created).
+    """
+    def __init__(self):
+        self.measurements = []
+        self.counts = {cls: 0 for cls in COUNTED_CLASSES}
+        self.originals = {}
+
+    def start(self):
+        for cls in COUNTED_CLASSES:
+            self.originals[cls] = cls.__init__
+            cls.__init__ = self.counting_init(cls, cls.__init__)
+        tracemalloc.start()
+
+    def stop(self):
+        tracemalloc.stop()
+        for cls, original in self.originals.items():
+            cls.__init__ = original
+        self.originals = {}
+
+    def counting_init(self, cls, original):
+        counts = self.counts
+
+        @functools.wraps(original)
+        def __init__(node, *args, **kwargs):
+            # LeafNode/ParentNode reach this once each through super()
+            counts[cls] += 1
+            original(node, *args, **kwargs)
+        return __init__
+
+    @contextlib.contextmanager
+    def measure(self, item, stage):
+        before = dict(self.counts)
+        tracemalloc.reset_peak()
+        start, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            _, peak = tracemalloc.get_traced_memory()
+            self.measurements.append((
+                peak - start, stage, os.fspath(item),
+                self.counts[TextNode] - before[TextNode],
+                self.counts[HTMLNode] - before[HTMLNode],
+            ))
+
+    def summary(self, top=10):
+        lines = ["Memory report:"]
+        if resource is not None:
+            # ru_maxrss is in KiB on Linux
+            max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            lines.append(f"  max RSS {max_rss / 1024:.1f} MB")
+        lines.append(
+            f"  {self.counts[TextNode]} TextNodes and {self.counts[HTMLNode]} HTMLNodes created"
+        )
+        stage_peaks = {}
+        for peak, stage, _, _, _ in self.measurements:
+            stage_peaks[stage] = max(stage_peaks.get(stage, 0), peak)
+        for stage, peak in stage_peaks.items():
+            lines.append(f"  largest {stage} peak {peak / 1e6:.2f} MB")
+        lines.append("Top offenders (peak, stage, TextNodes, HTMLNodes):")
+        for peak, stage, item, text_nodes, html_nodes in sorted(self.measurements, reverse=True)[:top]:
+            lines.append(f"  {peak / 1e6:>8.2f} MB  {stage:<8} {text_nodes:>8} {html_nodes:>8}  {item}")
+        return "\n".join(lines)
+
+# Report filled in by the build in this process, see configure_memory_report
+memory_report = None
+
+def configure_memory_report(enabled):
+    global memory_report
+    if memory_report is not None:
+        memory_report.stop()
+    memory_report = MemoryReport() if enabled else None
+    if memory_report is not None:
+        memory_report.start()
+    return memory_report
+
+def get_memory_report():
+    return memory_report
+
+def measure_memory(item, stage):
+    # No-op unless a memory report is running
+    if memory_report is None:
+        return contextlib.nullcontext()
+    return memory_report.measure(item, stage)
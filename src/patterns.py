@@ -0,0 +1,127 @@
+import re, time
+
+class CountingPattern:
+    """
+    Stands in for a compiled pattern while stats are on, counting calls and
+    the time spent matching (for finditer, the time spent iterating).
+    """
+    def __init__(self, name, pattern):
+        self.name = name
+        self.pattern = pattern
+        self.calls = 0
+        self.seconds = 0.0
+
+    def __getattr__(self, attr):
+        # flags, groupindex, pattern string, ...
+        return getattr(self.pattern, attr)
+
+    def timed(self, method, args, kwargs):
+        self.calls += 1
+        start = time.perf_counter()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            self.seconds += time.perf_counter() - start
+
+    def match(self, *args, **kwargs):
+        return self.timed(self.pattern.match, args, kwargs)
+
+    def fullmatch(self, *args, **kwargs):
+        return self.timed(self.pattern.fullmatch, args, kwargs)
+
+    def search(self, *args, **kwargs):
+        return self.timed(self.pattern.search, args, kwargs)
+
+    def findall(self, *args, **kwargs):
+        return self.timed(self.pattern.findall, args, kwargs)
+
+    def split(self, *args, **kwargs):
+        return self.timed(self.pattern.split, args, kwargs)
+
+    def sub(self, *args, **kwargs):
+        return self.timed(self.pattern.sub, args, kwargs)
+
+    def finditer(self, *args, **kwargs):
+        self.calls += 1
+        return self.iterate(self.pattern.finditer(*args, **kwargs))
+
+    def iterate(self, matches):
+        while True:
+            start = time.perf_counter()
+            match = next(matches, None)
+            self.seconds += time.perf_counter() - start
+            if match is None:
+                return
+            yield match
+
+class RegexRegistry:
+    """
+    Every parsing pattern, compiled once at import and looked up by name at
+    the call site (REGEX.inline.finditer(text)), so enable_stats() can swap
+    in counting wrappers without the callers knowing.
+    """
+    def __init__(self):
+        self.compiled = {}
+
+    def register(self, name, pattern, flags=0):
+        compiled = re.compile(pattern, flags)
+        self.compiled[name] = compiled
+        setattr(self, name, compiled)
+        return compiled
+
+    def enable_stats(self):
+        for name, compiled in self.compiled.items():
+            setattr(self, name, CountingPattern(name, compiled))
+
+    def disable_stats(self):
+        for name, compiled in self.compiled.items():
+            setattr(self, name, compiled)
+
+    def stats(self):
+        # (name, calls, seconds), slowest first; empty unless stats are on
+        counters = [getattr(self, name) for name in self.compiled]
+        return sorted(
+            ((c.name, c.calls, c.seconds) for c in counters if isinstance(c, CountingPattern)),
+            key=lambda stat: stat[2],
+            reverse=True,
+        )
+
+    def summary(self):
+        lines = ["Regex stats:"]
+        for name, calls, seconds in self.stats():
+            lines.append(f"  {name:<12} {calls:>8} calls {seconds * 1000:>10.2f} ms")
+        return "\n".join(lines)
+
+REGEX = RegexRegistry()
+
+REGEX.register("image", r"!\[([^\[\]]*)\]\(([^\(\)]*)\)")
+REGEX.register("link", r"(?<!!)\[([^\[\]]*)\]\(([^\(\)]*)\)")
+# One alternation covers every inline construct, so a single finditer pass
+# finds them all left to right. Whichever construct opens first wins and its
+# contents are taken literally. An opening delimiter that never closes falls
+# through to the "unclosed" group. The leading lookahead lets the engine skip
+# plain text without trying each alternative at every position.
+# Unlike the old split passes, which handled **, _ and ` before images and
+# links, a link that opens first keeps delimiters in its brackets: "[_]()_"
+# is a link with an empty URL (an error), not "[" followed by an italic.
+REGEX.register(
+    "inline",
+    r"(?=[*_`!\[])(?:"
+    r"\*\*(?P<bold>.*?)\*\*"
+    r"|_(?P<italic>.*?)_"
+    r"|`(?P<code>.*?)`"
+    r"|!\[(?P<alt>[^\[\]]*)\]\((?P<src>[^\(\)]*)\)"
+    r"|(?<!!)\[(?P<anchor>[^\[\]]*)\]\((?P<href>[^\(\)]*)\)"
+    r"|(?P<unclosed>\*\*|[_`])"
+    r")",
+    re.DOTALL,
+)
+# A whole ``` block, optionally with a language after the opening fence
+REGEX.register("code_fence", r"^```(?:\s*\w+)?\r?\n(.*?)\r?\n```$", re.DOTALL)
+# {{ Slot }} placeholders, and site-absolute href/src attributes whose URL is
+# rewritten at render time
+REGEX.register(
+    "template",
+    r"\{\{\s*(?P<slot>\w+)\s*\}\}"
+    r'|\b(?:href|src)="(?P<url>/[^"]*)"',
+)
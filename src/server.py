@@ -0,0 +1,253 @@
+import argparse, asyncio, email.utils, mimetypes, os, posixpath, urllib.parse
+from http import HTTPStatus
+from src.assets import is_fingerprinted
+from src.compress import is_compressible, sidecar_path
+
+# Idle keep-alive connections are closed after this many seconds
+KEEPALIVE_TIMEOUT = 15
+# Fingerprinted names change whenever their bytes do, so they never go stale
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+MAX_HEADER_BYTES = 64 * 1024
+# The build writes these as UTF-8
+UTF8_TYPES = ("text/html", "text/css")
+
+class Request:
+    def __init__(self, method, target, version, headers):
+        self.method = method
+        self.target = target
+        self.version = version
+        self.headers = headers  # lower-cased names
+
+    @property
+    def keep_alive(self):
+        connection = self.headers.get("connection", "").lower()
+        if self.version == "HTTP/1.1":
+            return connection != "close"
+        return connection == "keep-alive"
+
+    @property
+    def has_body(self):
+        if "transfer-encoding" in self.headers:
+            return True
+        length = self.headers.get("content-length")
+        if length is None:
+            return False
+        try:
+            return int(length) != 0
+        except ValueError:
+            return True
+
+def parse_request(data):
+    lines = data.decode("latin-1").split("\r\n")
+    method, target, version = lines[0].split(" ", 2)
+    headers = {}
+    for line in lines[1:]:
+        if not line:
+            continue
+        name, _, value = line.partition(":")
+        headers[name.strip().lower()] = value.strip()
+    return Request(method, target, version, headers)
+
+def make_etag(stat, encoding=None):
+    # The gzip representation gets its own tag so caches never mix them up
+    suffix = f"-{encoding}" if encoding else ""
+    return f'"{stat.st_mtime_ns:x}-{stat.st_size:x}{suffix}"'
+
+def accepts_gzip(header):
+    # An explicit gzip entry wins over *, whatever order they come in
+    qualities = {}
+    for part in header.split(","):
+        coding, _, params = part.partition(";")
+        quality = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                quality = float(value)
+            except ValueError:
+                quality = 0.0
+        qualities[coding.strip().lower()] = quality
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+def parse_range(header, size):
+    """
+    Parse a single "bytes=start-end" range. Returns (start, end) inclusive,
+    None to ignore the header (malformed or multiple ranges), or "invalid"
+    if the range can't be satisfied.
+    """
+    unit, _, spec = header.partition("=")
+    if unit.strip() != "bytes" or "," in spec:
+        return None
+    start_text, dash, end_text = spec.strip().partition("-")
+    if not dash:
+        return None
+    try:
+        if start_text == "":
+            # Suffix range: the last N bytes
+            length = int(end_text)
+            if length == 0:
+                return "invalid"
+            return max(size - length, 0), size - 1
+        start = int(start_text)
+        end = int(end_text) if end_text else size - 1
+    except ValueError:
+        return None
+    if start >= size or end < start:
+        return "invalid"
+    return start, min(end, size - 1)
+
+def is_not_modified(request, stat, etag):
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = [tag.strip() for tag in if_none_match.split(",")]
+        return "*" in tags or etag in tags or f"W/{etag}" in tags
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is not None:
+        try:
+            since = email.utils.parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        return int(stat.st_mtime) <= since
+    return False
+
+class StaticServer:
+    """
+    HTTP/1.1 static file server for the build output: keep-alive,
+    ETag/Last-Modified with 304s, single byte ranges, and bodies sent with
+    loop.sendfile (os.sendfile under the hood) so they never pass through
+    Python. Text files with a .gz sidecar (see src/compress.py) are sent
+    compressed to clients that accept gzip.
+    """
+    def __init__(self, root):
+        self.root = os.path.abspath(root)
+
+    def resolve(self, target):
+        url_path = urllib.parse.unquote(urllib.parse.urlsplit(target).path)
+        rel_path = posixpath.normpath(url_path).lstrip("/")
+        path = os.path.abspath(os.path.join(self.root, rel_path))
+        if path != self.root and not path.startswith(self.root + os.sep):
+            return None
+        if os.path.isdir(path):
+            path = os.path.join(path, "index.html")
+        return path if os.path.isfile(path) else None
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                try:
+                    data = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except asyncio.LimitOverrunError:
+                    await self.send_error(writer, HTTPStatus.REQUEST_HEADER_FIELDS_TOO_LARGE, False)
+                    break
+                try:
+                    request = parse_request(data)
+                except ValueError:
+                    await self.send_error(writer, HTTPStatus.BAD_REQUEST, False)
+                    break
+                # Bodies are never read, so close after replying rather than
+                # parse one as the next request
+                keep_alive = request.keep_alive and not request.has_body
+                if request.method not in ("GET", "HEAD"):
+                    await self.send_error(writer, HTTPStatus.METHOD_NOT_ALLOWED, False, {"Allow": "GET, HEAD"})
+                    break
+                else:
+                    await self.send_file(request, writer, keep_alive)
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    def write_head(self, writer, status, headers, keep_alive):
+        lines = [f"HTTP/1.1 {status.value} {status.phrase}"]
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        if keep_alive:
+            headers["Keep-Alive"] = f"timeout={KEEPALIVE_TIMEOUT}"
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def send_error(self, writer, status, keep_alive, headers=None):
+        body = f"{status.value} {status.phrase}\n".encode()
+        headers = dict(headers or {})
+        headers.update({"Content-Type": "text/plain; charset=utf-8", "Content-Length": str(len(body))})
+        self.write_head(writer, status, headers, keep_alive)
+        writer.write(body)
+        await writer.drain()
+
+    async def send_file(self, request, writer, keep_alive):
+        path = self.resolve(request.target)
+        if path is None:
+            return await self.send_error(writer, HTTPStatus.NOT_FOUND, keep_alive)
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        if content_type in UTF8_TYPES:
+            content_type += "; charset=utf-8"
+        cache_control = IMMUTABLE_CACHE_CONTROL if is_fingerprinted(path) else "no-cache"
+        encoding = None
+        vary = is_compressible(path) and os.path.isfile(sidecar_path(path))
+        if vary and accepts_gzip(request.headers.get("accept-encoding", "")):
+            path = sidecar_path(path)
+            encoding = "gzip"
+        with open(path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            etag = make_etag(stat, encoding)
+            headers = {
+                "Content-Type": content_type,
+                "ETag": etag,
+                "Last-Modified": email.utils.formatdate(stat.st_mtime, usegmt=True),
+                "Cache-Control": cache_control,
+                "Accept-Ranges": "bytes",
+            }
+            if encoding:
+                headers["Content-Encoding"] = encoding
+            if vary:
+                headers["Vary"] = "Accept-Encoding"
+            if is_not_modified(request, stat, etag):
+                del headers["Content-Type"]
+                headers.pop("Content-Encoding", None)
+                self.write_head(writer, HTTPStatus.NOT_MODIFIED, headers, keep_alive)
+                return await writer.drain()
+
+            status = HTTPStatus.OK
+            offset, count = 0, stat.st_size
+            range_header = request.headers.get("range")
+            if_range = request.headers.get("if-range")
+            if range_header and (if_range is None or if_range == etag):
+                byte_range = parse_range(range_header, stat.st_size)
+                if byte_range == "invalid":
+                    return await self.send_error(
+                        writer, HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, keep_alive,
+                        {"Content-Range": f"bytes */{stat.st_size}"},
+                    )
+                if byte_range is not None:
+                    start, end = byte_range
+                    status = HTTPStatus.PARTIAL_CONTENT
+                    offset, count = start, end - start + 1
+                    headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+            headers["Content-Length"] = str(count)
+            self.write_head(writer, status, headers, keep_alive)
+            await writer.drain()
+            if request.method == "GET" and count:
+                await asyncio.get_running_loop().sendfile(writer.transport, f, offset, count)
+
+async def serve(root, host="127.0.0.1", port=8000):
+    server = StaticServer(root)
+    tcp_server = await asyncio.start_server(server.handle_client, host, port, limit=MAX_HEADER_BYTES)
+    print(f"Serving {root} on http://{host}:{port}/")
+    async with tcp_server:
+        await tcp_server.serve_forever()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the built site (docs/) over HTTP/1.1.")
+    parser.add_argument("root", nargs="?", default="./docs")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.root, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
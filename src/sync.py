@@ -0,0 +1,159 @@
+import filecmp, fnmatch, os, shutil, tempfile
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+# Hand-placed files the build never writes but the host needs (GitHub Pages
+# reads CNAME and .nojekyll), matched against each part of the path under
+# the output directory
+KEEP_PATTERNS = (".*", "CNAME")
+
+# ioctl that asks copy-on-write filesystems (btrfs, XFS) to share extents
+FICLONE = 0x40049409
+
+# mkstemp creates 0600 files; outputs get the usual umask-based permissions.
+# Read once here since os.umask can only be queried by setting it.
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+class AtomicWriter:
+    """
+    Context manager that writes to a temp file next to dest_path and only
+    replaces dest_path (atomically, via os.replace) if the bytes differ
+    (or always, with compare=False).
+    Unchanged outputs keep their mtime, so rsync/CDN diffs stay small.
+    After the block, .changed says whether dest_path was rewritten.
+    """
+    def __init__(self, dest_path, mode='w', compare=True):
+        self.dest_path = os.fspath(dest_path)
+        self.mode = mode
+        self.compare = compare
+        self.changed = False
+
+    def __enter__(self):
+        dest_dir = os.path.dirname(self.dest_path) or "."
+        os.makedirs(dest_dir, exist_ok=True)
+        fd, self.tmp_path = tempfile.mkstemp(
+            dir=dest_dir, prefix=f".{os.path.basename(self.dest_path)}.", suffix=".tmp"
+        )
+        self.file = os.fdopen(fd, self.mode)
+        return self.file
+
+    def __exit__(self, exc_type, exc, tb):
+        self.file.close()
+        if exc_type is not None:
+            os.remove(self.tmp_path)
+            return False
+        if self.compare and os.path.isfile(self.dest_path) and filecmp.cmp(self.tmp_path, self.dest_path, shallow=False):
+            os.remove(self.tmp_path)
+            return False
+        os.chmod(self.tmp_path, 0o666 & ~_UMASK)
+        os.replace(self.tmp_path, self.dest_path)
+        self.changed = True
+        return False
+
+def is_up_to_date(from_path, dest_path):
+    # Static files are copied with their mtime, so matching size and mtime
+    # (or being the same inode, for hardlinks) means nothing changed
+    try:
+        dest_stat = os.stat(dest_path)
+    except FileNotFoundError:
+        return False
+    source_stat = os.stat(from_path)
+    if (source_stat.st_dev, source_stat.st_ino) == (dest_stat.st_dev, dest_stat.st_ino):
+        return True
+    return (
+        source_stat.st_size == dest_stat.st_size and
+        source_stat.st_mtime_ns == dest_stat.st_mtime_ns
+    )
+
+def copy_file_contents(source_fd, dest_fd):
+    # Cheapest first: reflink, then in-kernel copy_file_range, then sendfile
+    # or read/write via shutil
+    if fcntl is not None:
+        try:
+            fcntl.ioctl(dest_fd, FICLONE, source_fd)
+            return
+        except OSError:
+            pass
+    size = os.fstat(source_fd).st_size
+    if hasattr(os, "copy_file_range"):
+        offset = 0
+        try:
+            while offset < size:
+                copied = os.copy_file_range(source_fd, dest_fd, size - offset, offset, offset)
+                if copied == 0:
+                    break
+                offset += copied
+            if offset >= size:
+                return
+        except OSError:
+            pass
+        os.ftruncate(dest_fd, 0)
+    os.lseek(source_fd, 0, os.SEEK_SET)
+    os.lseek(dest_fd, 0, os.SEEK_SET)
+    with open(source_fd, 'rb', closefd=False) as source_file, open(dest_fd, 'wb', closefd=False) as dest_file:
+        shutil.copyfileobj(source_file, dest_file)
+
+def copy_if_changed(from_path, dest_path, hardlink=False):
+    # Returns True if dest_path had to be (re)written
+    if is_up_to_date(from_path, dest_path):
+        return False
+    dest_dir = os.path.dirname(dest_path) or "."
+    if hardlink:
+        tmp_path = os.path.join(dest_dir, f".{os.path.basename(dest_path)}.{os.getpid()}.link")
+        try:
+            os.link(from_path, tmp_path)
+            os.replace(tmp_path, dest_path)
+            return True
+        except OSError:
+            # e.g. across filesystems; fall back to copying
+            if os.path.lexists(tmp_path):
+                os.remove(tmp_path)
+    writer = AtomicWriter(dest_path, 'wb', compare=False)
+    with writer as dest_file, open(from_path, 'rb') as source_file:
+        dest_file.flush()
+        copy_file_contents(source_file.fileno(), dest_file.fileno())
+    shutil.copystat(from_path, dest_path)
+    return True
+
+def remove_empty_parents(path, stop_dir):
+    # After deleting path, remove the directories it leaves empty, up to
+    # but not including stop_dir
+    stop_dir = os.path.abspath(stop_dir)
+    dir_path = os.path.dirname(os.path.abspath(path))
+    while dir_path != stop_dir and dir_path.startswith(stop_dir + os.sep):
+        try:
+            os.rmdir(dir_path)
+        except OSError:  # not empty, or already gone
+            return
+        dir_path = os.path.dirname(dir_path)
+
+def is_kept(rel_path, patterns):
+    rel_path = rel_path.replace(os.sep, "/")
+    parts = rel_path.split("/")
+    return any(
+        fnmatch.fnmatchcase(rel_path, pattern) or any(fnmatch.fnmatchcase(part, pattern) for part in parts)
+        for pattern in patterns
+    )
+
+def remove_orphans(dest_dir_path, keep_paths, keep_patterns=KEEP_PATTERNS):
+    """
+    Delete every file under dest_dir_path that isn't in keep_paths, then any
+    directories left empty. Files whose relative path, or any part of it,
+    matches one of keep_patterns are left alone. Returns the removed file
+    paths.
+    """
+    keep = {os.path.abspath(path) for path in keep_paths}
+    removed = []
+    for root, dirs, files in os.walk(dest_dir_path, topdown=False):
+        for filename in files:
+            path = os.path.join(root, filename)
+            if os.path.abspath(path) in keep or is_kept(os.path.relpath(path, dest_dir_path), keep_patterns):
+                continue
+            os.remove(path)
+            removed.append(path)
+        if root != dest_dir_path and not os.listdir(root):
+            os.rmdir(root)
+    return removed
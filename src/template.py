@@ -0,0 +1,59 @@
+import os
+from src.patterns import REGEX
+
+class Template:
+    """
+    A page template parsed once into segments. Each segment is a
+    (kind, value) pair: ("text", literal), ("slot", name) or ("url", url).
+    """
+    def __init__(self, text):
+        self.segments = []
+        self.placeholders = {}
+        pos = 0
+        for match in REGEX.template.finditer(text):
+            kind = match.lastgroup
+            start, end = match.span(kind)
+            if kind == "slot":
+                start, end = match.span()
+                self.placeholders[match.group(kind)] = match.group()
+            if start > pos:
+                self.segments.append(("text", text[pos:start]))
+            self.segments.append((kind, match.group(kind)))
+            pos = end
+        if pos < len(text):
+            self.segments.append(("text", text[pos:]))
+
+    def iter_chunks(self, slots, rewrite_url=None):
+        for kind, value in self.segments:
+            if kind == "text":
+                yield value
+            elif kind == "url":
+                yield value if rewrite_url is None else rewrite_url(value)
+            else:
+                # Slots without a value are left in place, as str.replace would
+                slot_value = slots.get(value, self.placeholders[value])
+                if isinstance(slot_value, str):
+                    yield slot_value
+                else:
+                    yield from slot_value
+
+    def render(self, rewrite_url=None, **slots):
+        return "".join(self.iter_chunks(slots, rewrite_url))
+
+    def write(self, fp, rewrite_url=None, **slots):
+        # Slot values may be strings or iterables of chunks (e.g. iter_html())
+        fp.writelines(self.iter_chunks(slots, rewrite_url))
+
+_template_cache = {}
+
+def load_template(template_path):
+    # Reuse the compiled template until the file's mtime or size changes
+    stat = os.stat(template_path)
+    key = os.path.abspath(template_path)
+    cached = _template_cache.get(key)
+    if cached is not None and cached[0] == (stat.st_mtime_ns, stat.st_size):
+        return cached[1]
+    with open(template_path, 'r') as template_file:
+        template = Template(template_file.read())
+    _template_cache[key] = ((stat.st_mtime_ns, stat.st_size), template)
+    return template
@@ -0,0 +1,65 @@
+import json, os, unittest
+from unittest import mock
+from src.assets import ASSET_MANIFEST_NAME, fingerprint_name, fingerprint_static, is_fingerprinted
+from src.manifest import hash_file
+from src.test_support import TempDirTestCase
+from src.urls import make_url_rewriter
+
+class TestAssets(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.static = self.path("static")
+        self.dest = self.path("docs")
+        self.write("static/index.css", "body {}")
+        self.write("static/images/tom.png", "png")
+
+    def test_fingerprint_name(self):
+        self.assertEqual(fingerprint_name("images/tom.png", "3f9a1c2b77"), "images/tom.3f9a1c2b.png")
+        self.assertTrue(is_fingerprinted("docs/index.3f9a1c2b.css"))
+        self.assertFalse(is_fingerprinted("docs/index.css"))
+
+    def test_fingerprint_static(self):
+        outputs, assets = fingerprint_static(self.static, self.dest)
+        self.assertEqual(sorted(assets), ["/images/tom.png", "/index.css"])
+        for url, hashed_url in assets.items():
+            self.assertTrue(is_fingerprinted(hashed_url))
+            self.assertTrue(os.path.isfile(os.path.join(self.dest, hashed_url[1:])))
+        with open(os.path.join(self.dest, ASSET_MANIFEST_NAME)) as f:
+            self.assertEqual(json.load(f), assets)
+        self.assertEqual(len(outputs), 3)
+
+    def test_name_changes_only_with_content(self):
+        _, first = fingerprint_static(self.static, self.dest)
+        _, second = fingerprint_static(self.static, self.dest)
+        self.assertEqual(first, second)
+        self.write("static/index.css", "body { color: red }")
+        _, third = fingerprint_static(self.static, self.dest)
+        self.assertNotEqual(first["/index.css"], third["/index.css"])
+        self.assertEqual(first["/images/tom.png"], third["/images/tom.png"])
+
+    def test_digest_cache_skips_unchanged_files(self):
+        digests = {}
+        with mock.patch("src.assets.hash_file", wraps=hash_file) as hashed:
+            _, first = fingerprint_static(self.static, self.dest, digests=digests)
+            self.assertEqual(hashed.call_count, 2)
+            _, second = fingerprint_static(self.static, self.dest, digests=digests)
+            self.assertEqual(hashed.call_count, 2)
+            self.assertEqual(first, second)
+            self.write("static/index.css", "body { color: red }")
+            _, third = fingerprint_static(self.static, self.dest, digests=digests)
+            self.assertEqual(hashed.call_count, 3)
+        self.assertNotEqual(first["/index.css"], third["/index.css"])
+        os.remove(self.path("static", "images", "tom.png"))
+        fingerprint_static(self.static, self.dest, digests=digests)
+        self.assertEqual(list(digests), [os.path.abspath(self.path("static", "index.css"))])
+
+    def test_rewriter_uses_assets(self):
+        assets = {"/index.css": "/index.3f9a1c2b.css"}
+        rewrite_url = make_url_rewriter("/", assets)
+        self.assertEqual(rewrite_url("/index.css"), "/index.3f9a1c2b.css")
+        self.assertEqual(rewrite_url("/blog"), "/blog")
+        rewrite_url = make_url_rewriter("/Sstatick/", assets)
+        self.assertEqual(rewrite_url("/index.css"), "/Sstatick/index.3f9a1c2b.css")
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+import os, pickle, tempfile, unittest
+from src.block_cache import BlockCache
+from src.blocktype import markdown_to_html_node
+from src.htmlnode import LeafNode, ParentNode
+
+class TestBlockCache(unittest.TestCase):
+    def test_hits_and_misses(self):
+        cache = BlockCache()
+        self.assertIsNone(cache.get("a"))
+        node = LeafNode("p", "a")
+        cache.put("a", node)
+        self.assertIs(cache.get("a"), node)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_lru_eviction(self):
+        cache = BlockCache(max_entries=2)
+        cache.put("a", LeafNode(None, "a"))
+        cache.put("b", LeafNode(None, "b"))
+        cache.get("a")  # "b" is now least recently used
+        cache.put("c", LeafNode(None, "c"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_markdown_to_html_node_uses_cache(self):
+        markdown = "Shared **footer**\n\nBody one\n\nShared **footer**"
+        cache = BlockCache()
+        cached = markdown_to_html_node(markdown, cache=cache)
+        self.assertEqual(cached.to_html(), markdown_to_html_node(markdown).to_html())
+        self.assertEqual((cache.hits, cache.misses), (1, 2))
+
+    def test_persistence(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "blocks.pickle")
+            cache = BlockCache(path=path)
+            cache.put("a", ParentNode("p", [LeafNode("a", "x", {"href": "/x"})]))
+            cache.save()
+            loaded = BlockCache.load(path)
+            self.assertEqual(loaded.get("a").to_html(), '<p><a href="/x">x</a></p>')
+
+    def test_drain_and_merge(self):
+        # A worker's new entries and counts end up in the parent's cache
+        worker = BlockCache(path="blocks.pickle")
+        worker.get("a")
+        worker.put("a", LeafNode("p", "a"))
+        worker.get("a")
+        parent = BlockCache(path="blocks.pickle")
+        parent.merge(worker.drain())
+        self.assertEqual(parent.get("a").to_html(), "<p>a</p>")
+        self.assertEqual((parent.hits, parent.misses), (2, 1))
+        self.assertEqual(worker.drain(), ({}, 0, 0))
+
+    def test_nodes_pickle(self):
+        node = ParentNode("div", [LeafNode("b", "bold"), LeafNode(None, "text")])
+        restored = pickle.loads(pickle.dumps(node))
+        self.assertIsInstance(restored, ParentNode)
+        self.assertEqual(restored.to_html(), node.to_html())
+        self.assertIs(restored.children[0].children, LeafNode("i", "x").children)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
 from src.blocktype import BlockType, block_to_block_type, markdown_to_html_node
 from src.htmlnode import HTMLNode, LeafNode, ParentNode
-from src.blocktype import block_to_html_node
+from src.blocktype import block_to_html_node, classify_block
 
 class TestBlockToBlockType(unittest.TestCase):
     
@@ -241,6 +241,11 @@ class TestBlockToBlockType(unittest.TestCase):
         weird_block = "># This looks like a quote and heading\n```But doesn't close properly"
         self.assertEqual(block_to_block_type(weird_block), BlockType.PARAGRAPH)
 
+    def test_classify_block_returns_lines(self):
+        self.assertEqual(classify_block("- a\n- b"), (BlockType.UNORDERED_LIST, ["- a", "- b"]))
+        self.assertEqual(classify_block("1. a\n3. b"), (BlockType.PARAGRAPH, ["1. a", "3. b"]))
+        self.assertEqual(classify_block(""), (BlockType.PARAGRAPH, [""]))
+
 class TestMarkdownToHtmlNode(unittest.TestCase):
     def test_paragraph(self):
         md = """
@@ -338,4 +343,9 @@ the **same** even with inline stuff
         self.assertEqual(
             html,
             "<div><pre><code>This is text that _should_ remain\nthe **same** even with inline stuff\n</code></pre></div>",
-        )
\ No newline at end of file
+        )
+
+    def test_long_ordered_list(self):
+        md = "\n".join(f"{i}. item" for i in range(1, 12))
+        html = markdown_to_html_node(md).to_html()
+        self.assertEqual(html, "<div><ol>" + "<li>item</li>" * 11 + "</ol></div>")
@@ -0,0 +1,40 @@
+import gzip, os, unittest
+from src.compress import compress_outputs, write_sidecar
+from src.test_support import TempDirTestCase
+
+class TestCompress(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.page = self.write("index.html", "<p>hello</p>" * 100)
+
+    def test_sidecar_round_trips_and_is_deterministic(self):
+        gz_path, written = write_sidecar(self.page)
+        self.assertTrue(written)
+        with open(gz_path, 'rb') as f:
+            first = f.read()
+        self.assertEqual(gzip.decompress(first).decode(), "<p>hello</p>" * 100)
+        os.remove(gz_path)
+        write_sidecar(self.page)
+        with open(gz_path, 'rb') as f:
+            self.assertEqual(f.read(), first)
+
+    def test_skips_unchanged_by_hash(self):
+        hashes = {}
+        self.assertTrue(write_sidecar(self.page, hashes)[1])
+        self.assertFalse(write_sidecar(self.page, hashes)[1])
+        self.write("index.html", "<p>changed</p>" * 100)
+        self.assertTrue(write_sidecar(self.page, hashes)[1])
+
+    def test_compress_outputs(self):
+        image = self.write("image.png", "not text")
+        tiny = self.write("tiny.css", "a{}")
+        cache_path = os.path.join(self.dir, "cache", "gzip.json")
+        sidecars = compress_outputs([self.page, image, tiny], cache_path)
+        # Images are skipped, and so is anything gzip would make bigger
+        self.assertEqual(sidecars, [self.page + ".gz"])
+        self.assertFalse(os.path.exists(image + ".gz"))
+        self.assertFalse(os.path.exists(tiny + ".gz"))
+        self.assertTrue(os.path.exists(cache_path))
+
+if __name__ == "__main__":
+    unittest.main()
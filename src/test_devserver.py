@@ -0,0 +1,37 @@
+import os, unittest
+from src.devserver import DevSite, RELOAD_SCRIPT
+from src.test_support import TempDirTestCase
+
+class TestDevSite(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("content/index.md", "# Home\n\nHello")
+        self.write("content/blog/tom/index.md", "# Tom\n\nPost")
+        self.write("template.html", "<html><body>{{ Content }}</body></html>")
+        os.makedirs(self.path("static"))
+        self.site = DevSite(self.path("content"), self.path("static"), self.path("template.html"))
+
+    def test_markdown_for(self):
+        tom = self.path("content/blog/tom/index.md")
+        self.assertEqual(self.site.markdown_for("/"), self.path("content/index.md"))
+        self.assertEqual(self.site.markdown_for("/blog/tom"), tom)
+        self.assertEqual(self.site.markdown_for("/blog/tom/"), tom)
+        self.assertEqual(self.site.markdown_for("/blog/tom/index.html"), tom)
+        self.assertIsNone(self.site.markdown_for("/blog/missing"))
+        self.assertIsNone(self.site.markdown_for("/../template.html"))
+
+    def test_render_injects_reload_script(self):
+        body = self.site.render(self.path("content/index.md")).decode()
+        self.assertIn("<h1>Home</h1>", body)
+        self.assertIn(RELOAD_SCRIPT + "</body>", body)
+
+    def test_render_cache_invalidated_by_mtime(self):
+        markdown_path = self.path("content/index.md")
+        first = self.site.render(markdown_path)
+        self.assertIs(self.site.render(markdown_path), first)
+        self.write("content/index.md", "# Home\n\nEdited")
+        os.utime(markdown_path, ns=(0, 0))
+        self.assertIn(b"Edited", self.site.render(markdown_path))
+
+if __name__ == "__main__":
+    unittest.main()
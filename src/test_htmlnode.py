@@ -1,5 +1,7 @@
+import io
 import unittest
 from src.htmlnode import HTMLNode, LeafNode, ParentNode
+from src.urls import make_url_rewriter
 
 class TestHTMLNode(unittest.TestCase):
     def test_props_to_html(self):
@@ -111,6 +113,17 @@ class TestHTMLNode(unittest.TestCase):
             {}, #or none
         )
 
+    def test_compact_nodes(self):
+        node = LeafNode("b", "Bold")
+        self.assertFalse(hasattr(node, "__dict__"))
+        # Nodes without children/props share the same empty containers
+        self.assertIs(node.children, LeafNode("i", "x").children)
+        self.assertIs(node.props, LeafNode("i", "x").props)
+        with self.assertRaises(TypeError):
+            node.children.append(LeafNode(None, "x"))
+        with self.assertRaises(TypeError):
+            node.props["class"] = "x"
+
 class TestLeafNode(unittest.TestCase):
     def test_leaf_to_html_p(self):
         node = LeafNode("p", "Hello, world!")
@@ -293,6 +306,36 @@ class TestParentNode(unittest.TestCase):
             node.to_html(),
             "<h2><b>Bold text</b>Normal text<i>italic text</i>Normal text</h2>",
         )
+
+    def test_iter_html_chunks(self):
+        node = ParentNode("p", [LeafNode("b", "Bold"), LeafNode(None, " text")])
+        self.assertEqual(list(node.iter_html()), ["<p>", "<b>Bold</b>", " text", "</p>"])
+
+    def test_write_html(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode("i", "deep")])], {"class": "x"})
+        buffer = io.StringIO()
+        node.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), node.to_html())
+        self.assertEqual(buffer.getvalue(), '<div class="x"><p><i>deep</i></p></div>')
+
+    def test_rewrite_url(self):
+        node = ParentNode("p", [
+            LeafNode("a", "home", {"href": "/blog"}),
+            LeafNode("img", "", {"src": "/images/a.png", "alt": "/alt"}),
+            LeafNode("a", "out", {"href": "https://boot.dev"}),
+            LeafNode("code", 'href="/x"'),
+        ])
+        self.assertEqual(
+            node.to_html(make_url_rewriter("/Sstatick/")),
+            '<p><a href="/Sstatick/blog">home</a><img src="/Sstatick/images/a.png" alt="/alt"></img>'
+            '<a href="https://boot.dev">out</a><code>href="/x"</code></p>',
+        )
+
+    def test_write_html_large_page(self):
+        node = ParentNode("div", [ParentNode("p", [LeafNode(None, "x")]) for _ in range(10000)])
+        buffer = io.StringIO()
+        node.write_html(buffer)
+        self.assertEqual(buffer.getvalue(), "<div>" + "<p>x</p>" * 10000 + "</div>")
         
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
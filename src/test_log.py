@@ -0,0 +1,59 @@
+import io, json, os, tempfile, unittest
+from src.log import DEBUG, INFO, BuildLog
+
+class TestBuildLog(unittest.TestCase):
+    def test_summary_mode_counts_without_printing(self):
+        stream = io.StringIO()
+        build_log = BuildLog(INFO, "summary", stream=stream)
+        build_log.event(INFO, "page", "Generated a")
+        build_log.event(DEBUG, "page_skipped", "Up to date: b")
+        build_log.report("Built 1 page(s)")
+        self.assertEqual(stream.getvalue(), "Built 1 page(s)\n")
+        self.assertEqual((build_log.count("page"), build_log.count("page_skipped")), (1, 1))
+
+    def test_verbose_mode_respects_level(self):
+        stream = io.StringIO()
+        build_log = BuildLog(INFO, "verbose", stream=stream)
+        build_log.event(INFO, "page", "Generated a")
+        build_log.event(DEBUG, "page_skipped", "Up to date: b")
+        self.assertEqual(stream.getvalue(), "Generated a\n")
+
+    def test_quiet_mode_keeps_warnings(self):
+        stream = io.StringIO()
+        build_log = BuildLog(INFO, "quiet", stream=stream)
+        build_log.event(INFO, "page", "Generated a")
+        build_log.report("Built 1 page(s)")
+        build_log.event(40, "page_failed", "Failed b")
+        self.assertEqual(stream.getvalue(), "Failed b\n")
+
+    def test_json_sink(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            json_path = os.path.join(tmp, "build.jsonl")
+            build_log = BuildLog(INFO, "summary", json_path, stream=io.StringIO())
+            build_log.event(INFO, "page", "Generated a", dest="a.html")
+            build_log.event(DEBUG, "page_skipped", "Up to date: b")
+            build_log.report("done", pages=1)
+            build_log.close()
+            with open(json_path) as f:
+                records = [json.loads(line) for line in f]
+        self.assertEqual([record["event"] for record in records], ["page", "report"])
+        self.assertEqual(records[0]["dest"], "a.html")
+        self.assertEqual(records[1]["pages"], 1)
+
+    def test_context_manager_logs_failure_and_closes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "build.jsonl")
+            stream = io.StringIO()
+            with self.assertRaises(OSError):
+                with BuildLog(INFO, "summary", path, stream) as build_log:
+                    build_log.event(INFO, "page", "Generated a")
+                    raise OSError("disk full")
+            self.assertIsNone(build_log.json_file)
+            with open(path) as f:
+                records = [json.loads(line) for line in f]
+            self.assertEqual([record["event"] for record in records], ["page", "build_failed"])
+            self.assertEqual(records[-1]["level"], "error")
+            self.assertEqual(stream.getvalue(), "Build failed: disk full\n")
+
+if __name__ == "__main__":
+    unittest.main()
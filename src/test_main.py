@@ -0,0 +1,25 @@
+import argparse, contextlib, io, unittest
+from src.main import parse_args, parse_variant
+
+class TestParseArgs(unittest.TestCase):
+    def test_parse_variant(self):
+        self.assertEqual(parse_variant("/Sstatick/=docs"), ("/Sstatick/", "docs"))
+        self.assertEqual(parse_variant("/=build/a=b"), ("/", "build/a=b"))
+        for value in ("docs", "=docs", "/base/=", ""):
+            with self.assertRaises(argparse.ArgumentTypeError):
+                parse_variant(value)
+
+    def test_basepath_defaults_to_root(self):
+        self.assertEqual(parse_args([]).basepath, "/")
+        self.assertEqual(parse_args(["/Sstatick/"]).basepath, "/Sstatick/")
+
+    def test_variants(self):
+        args = parse_args(["--variant", "/=public", "--variant", "/Sstatick/=docs"])
+        self.assertEqual(args.variant, [("/", "public"), ("/Sstatick/", "docs")])
+
+    def test_basepath_with_variant_is_rejected(self):
+        with contextlib.redirect_stderr(io.StringIO()), self.assertRaises(SystemExit):
+            parse_args(["/Sstatick/", "--variant", "/=public"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+import os, tempfile, unittest
+from src.manifest import BuildManifest, hash_file, manifest_path_for
+
+class TestBuildManifest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.dir = self.tmp.name
+        self.template_path = os.path.join(self.dir, "template.html")
+        with open(self.template_path, 'w') as f:
+            f.write("<html>{{ Content }}</html>")
+        self.manifest_path = os.path.join(self.dir, "manifest.json")
+        self.dest_path = os.path.join(self.dir, "index.html")
+        with open(self.dest_path, 'w') as f:
+            f.write("<html></html>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_missing_manifest_is_empty(self):
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/")
+        self.assertEqual(manifest.pages, {})
+        self.assertFalse(manifest.is_fresh(self.dest_path, "abc"))
+
+    def test_round_trip(self):
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/")
+        manifest.record(self.dest_path, "abc")
+        manifest.save()
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/")
+        self.assertTrue(manifest.is_fresh(self.dest_path, "abc"))
+        self.assertFalse(manifest.is_fresh(self.dest_path, "def"))
+
+    def test_missing_output_is_stale(self):
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/")
+        manifest.record(self.dest_path, "abc")
+        os.remove(self.dest_path)
+        self.assertFalse(manifest.is_fresh(self.dest_path, "abc"))
+
+    def test_basepath_change_invalidates(self):
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/")
+        manifest.record(self.dest_path, "abc")
+        manifest.save()
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/Sstatick/")
+        self.assertEqual(manifest.pages, {})
+
+    def test_assets_change_invalidates(self):
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/", "abc")
+        manifest.record(self.dest_path, "abc")
+        manifest.save()
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/", "abc")
+        self.assertTrue(manifest.is_fresh(self.dest_path, "abc"))
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/", "def")
+        self.assertEqual(manifest.pages, {})
+
+    def test_template_change_invalidates(self):
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/")
+        manifest.record(self.dest_path, "abc")
+        manifest.save()
+        with open(self.template_path, 'w') as f:
+            f.write("<body>{{ Content }}</body>")
+        manifest = BuildManifest.load(self.manifest_path, self.template_path, "/")
+        self.assertEqual(manifest.pages, {})
+
+    def test_prune(self):
+        manifest = BuildManifest(self.manifest_path, "t", "/", pages={"a.html": "1", "b.html": "2"})
+        manifest.record("a.html", "1")
+        self.assertEqual(manifest.prune(), ["b.html"])
+        self.assertEqual(manifest.pages, {"a.html": "1"})
+
+    def test_hash_file(self):
+        self.assertEqual(hash_file(self.dest_path), hash_file(self.dest_path))
+        self.assertEqual(len(hash_file(self.dest_path)), 64)
+
+class TestManifestPathFor(unittest.TestCase):
+    def test_one_manifest_per_output(self):
+        self.assertEqual(manifest_path_for(".cache", "./docs"), os.path.join(".cache", "manifest-docs.json"))
+        self.assertNotEqual(manifest_path_for(".cache", "docs"), manifest_path_for(".cache", "public"))
+
+if __name__ == "__main__":
+    unittest.main()
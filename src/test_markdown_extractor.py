@@ -1,7 +1,7 @@
-import unittest
+import tempfile, unittest
 from src.inline_markdown import extract_markdown_images, extract_markdown_links
 from src.inline_markdown import split_nodes_image, split_nodes_link
-from src.inline_markdown import text_to_textnodes, markdown_to_blocks 
+from src.inline_markdown import text_to_textnodes, markdown_to_blocks, scan_blocks
 from src.textnode import TextNode, TextType
 
 
@@ -330,6 +330,24 @@ class TestMarkdownParser(unittest.TestCase):
             new_nodes,
         )
 
+    def test_split_nodes_link_same_markdown_as_image(self): # Link identical to an earlier image's markdown
+        node = TextNode("![a](b) then [a](b)", TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        self.assertListEqual(
+            [
+                TextNode("![a](b) then ", TextType.TEXT),
+                TextNode("a", TextType.LINK, "b"),
+            ],
+            new_nodes,
+        )
+
+    def test_split_nodes_link_many_links(self): # Many links in one node
+        node = TextNode("x [l](u) " * 1000, TextType.TEXT)
+        new_nodes = split_nodes_link([node])
+        self.assertEqual(len(new_nodes), 2001)
+        self.assertEqual(new_nodes[1], TextNode("l", TextType.LINK, "u"))
+        self.assertEqual(new_nodes[-1], TextNode(" ", TextType.TEXT))
+
     def test_edge_cases(self): # Empty nodes list
         self.assertListEqual([], split_nodes_link([]))
         self.assertListEqual([], split_nodes_image([]))
@@ -770,6 +788,49 @@ class TestTestToTestNodes(unittest.TestCase):
             if expected[i].url:
                 self.assertEqual(result[i].url, expected[i].url)
         
+    def test_delimiters_inside_code(self):
+        text = "Call `snake_case` and `**kwargs`"
+        expected = [
+            TextNode("Call ", TextType.TEXT),
+            TextNode("snake_case", TextType.CODE),
+            TextNode(" and ", TextType.TEXT),
+            TextNode("**kwargs", TextType.CODE),
+        ]
+        self.assertListEqual(text_to_textnodes(text), expected)
+
+    def test_underscore_in_link_url(self):
+        text = "See [the docs](https://example.com/some_page)"
+        expected = [
+            TextNode("See ", TextType.TEXT),
+            TextNode("the docs", TextType.LINK, "https://example.com/some_page"),
+        ]
+        self.assertListEqual(text_to_textnodes(text), expected)
+
+    def test_paired_underscores_in_link(self):
+        # The old split passes turned these into italics inside the link text
+        text = "[snake_case_name](https://example.com/a_b_c)"
+        expected = [TextNode("snake_case_name", TextType.LINK, "https://example.com/a_b_c")]
+        self.assertListEqual(text_to_textnodes(text), expected)
+
+    def test_code_span_after_delimiter_text(self):
+        text = "`a_b` then _c_"
+        expected = [
+            TextNode("a_b", TextType.CODE),
+            TextNode(" then ", TextType.TEXT),
+            TextNode("c", TextType.ITALIC),
+        ]
+        self.assertListEqual(text_to_textnodes(text), expected)
+
+    def test_delimiter_inside_empty_link_is_not_italic(self):
+        # Links are matched before the _ inside them, so this is a link with
+        # no URL rather than "[" followed by an italic "]("
+        with self.assertRaises(ValueError):
+            text_to_textnodes("![i](p)[_]()_")
+
+    def test_unclosed_delimiter(self):
+        with self.assertRaises(ValueError):
+            text_to_textnodes("This **never closes")
+
 class TestBlockSplitter(unittest.TestCase):
     def test_markdown_to_blocks(self):
         md = """
@@ -856,5 +917,46 @@ class TestBlockSplitter(unittest.TestCase):
         result = markdown_to_blocks(md)
         self.assertEqual(result, expected_output, f"Expected {expected_output}, but got {result}")
 
+    def test_fence_with_blank_lines_is_one_block(self):
+        md = "Intro\n\n```\ndef f():\n\n    return 1\n```\n\nOutro"
+        self.assertEqual(
+            markdown_to_blocks(md),
+            ["Intro", "```\ndef f():\n\n    return 1\n```", "Outro"],
+        )
+
+    def test_fence_keeps_relative_indentation(self):
+        md = """
+        ```
+        if x:
+            y()
+        ```
+        """
+        self.assertEqual(markdown_to_blocks(md), ["```\nif x:\n    y()\n```"])
+
+    def test_unclosed_fence_runs_to_end(self):
+        self.assertEqual(markdown_to_blocks("```\na\n\nb"), ["```\na\n\nb"])
+
+    def test_spans(self):
+        md = "# Title\n\n  para one\n  para two  \n"
+        spans = list(scan_blocks(md.splitlines(keepends=True)))
+        self.assertEqual([block for _, _, block in spans], ["# Title", "para one\npara two"])
+        self.assertEqual([md[start:end] for start, end, _ in spans], ["# Title", "para one\n  para two"])
+
+    def test_fence_spans_ignore_trailing_whitespace(self):
+        md = "```  \ncode   \n\n```   \n\nafter  \n"
+        spans = list(scan_blocks(md.splitlines(keepends=True)))
+        self.assertEqual([block for _, _, block in spans], ["```\ncode\n\n```", "after"])
+        self.assertEqual([md[start:end] for start, end, _ in spans], ["```  \ncode   \n\n```", "after"])
+        # An unclosed fence ending in blank lines stops at its last text
+        md = "```\ncode  \n\n"
+        [(start, end, _)] = scan_blocks(md.splitlines(keepends=True))
+        self.assertEqual(md[start:end], "```\ncode")
+
+    def test_file_iterator(self):
+        with tempfile.NamedTemporaryFile('w+', suffix=".md") as f:
+            f.write("One\n\nTwo\nlines\n")
+            f.seek(0)
+            self.assertEqual(markdown_to_blocks(f), ["One", "Two\nlines"])
+
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
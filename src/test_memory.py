@@ -0,0 +1,45 @@
+import unittest
+from src.block_cache import block_cache_settings, configure_block_cache
+from src.blocktype import markdown_to_html_node
+from src.htmlnode import HTMLNode, LeafNode
+from src.memory import configure_memory_report, get_memory_report, measure_memory
+from src.textnode import TextNode, TextType
+
+class TestMemoryReport(unittest.TestCase):
+    def tearDown(self):
+        configure_memory_report(False)
+
+    def test_counts_node_constructions(self):
+        report = configure_memory_report(True)
+        with measure_memory("page.md", "parse"):
+            TextNode("a", TextType.TEXT)
+            LeafNode("b", "x")
+            HTMLNode("p")
+        [(peak, stage, item, text_nodes, html_nodes)] = report.measurements
+        self.assertEqual((stage, item, text_nodes, html_nodes), ("parse", "page.md", 1, 2))
+        self.assertGreaterEqual(peak, 0)
+
+    def test_measures_allocations(self):
+        # Parse for real rather than from the block cache
+        settings = block_cache_settings()
+        configure_block_cache(0)
+        self.addCleanup(configure_block_cache, *settings)
+        report = configure_memory_report(True)
+        with measure_memory("big.md", "parse"):
+            markdown_to_html_node("\n\n".join(f"Paragraph **{i}** here" for i in range(200)))
+        peak = report.measurements[0][0]
+        self.assertGreater(peak, 10000)
+        self.assertIn("big.md", report.summary())
+
+    def test_stop_restores_constructors(self):
+        original = TextNode.__init__
+        configure_memory_report(True)
+        self.assertIsNot(TextNode.__init__, original)
+        configure_memory_report(False)
+        self.assertIs(TextNode.__init__, original)
+        self.assertIsNone(get_memory_report())
+        with measure_memory("x", "parse"):
+            pass
+
+if __name__ == "__main__":
+    unittest.main()
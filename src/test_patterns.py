@@ -0,0 +1,30 @@
+import unittest
+from src.patterns import REGEX, CountingPattern, RegexRegistry
+
+class TestRegexRegistry(unittest.TestCase):
+    def setUp(self):
+        self.registry = RegexRegistry()
+        self.registry.register("word", r"\w+")
+
+    def test_register(self):
+        self.assertEqual(self.registry.word.findall("a bc"), ["a", "bc"])
+        self.assertEqual(self.registry.stats(), [])
+
+    def test_stats(self):
+        self.registry.enable_stats()
+        self.assertIsInstance(self.registry.word, CountingPattern)
+        self.assertEqual([m.group() for m in self.registry.word.finditer("a bc")], ["a", "bc"])
+        self.assertEqual(self.registry.word.match("xy").group(), "xy")
+        [(name, calls, seconds)] = self.registry.stats()
+        self.assertEqual((name, calls), ("word", 2))
+        self.assertGreaterEqual(seconds, 0)
+        self.assertIn("word", self.registry.summary())
+        self.registry.disable_stats()
+        self.assertNotIsInstance(self.registry.word, CountingPattern)
+
+    def test_parsing_patterns_registered(self):
+        for name in ("image", "link", "inline", "code_fence", "template"):
+            self.assertIn(name, REGEX.compiled)
+
+if __name__ == "__main__":
+    unittest.main()
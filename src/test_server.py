@@ -0,0 +1,124 @@
+import asyncio, gzip, os, tempfile, unittest
+from src.server import StaticServer, accepts_gzip, parse_range
+
+class TestParseRange(unittest.TestCase):
+    def test_ranges(self):
+        self.assertEqual(parse_range("bytes=0-9", 100), (0, 9))
+        self.assertEqual(parse_range("bytes=90-", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=-10", 100), (90, 99))
+        self.assertEqual(parse_range("bytes=50-500", 100), (50, 99))
+
+    def test_unsatisfiable_and_ignored(self):
+        self.assertEqual(parse_range("bytes=100-", 100), "invalid")
+        self.assertEqual(parse_range("bytes=5-1", 100), "invalid")
+        self.assertIsNone(parse_range("bytes=0-1,5-6", 100))
+        self.assertIsNone(parse_range("items=0-1", 100))
+        self.assertIsNone(parse_range("bytes=a-b", 100))
+
+    def test_accepts_gzip(self):
+        self.assertTrue(accepts_gzip("gzip, deflate, br"))
+        self.assertTrue(accepts_gzip("br;q=1.0, gzip;q=0.8"))
+        self.assertTrue(accepts_gzip("*"))
+        self.assertFalse(accepts_gzip("gzip;q=0"))
+        self.assertFalse(accepts_gzip("identity"))
+        self.assertTrue(accepts_gzip("*;q=0, gzip"))
+        self.assertFalse(accepts_gzip("gzip;q=0, *"))
+        self.assertFalse(accepts_gzip(""))
+
+class TestStaticServer(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self.tmp.name, "blog"))
+        with open(os.path.join(self.tmp.name, "index.html"), 'w') as f:
+            f.write("<h1>Home</h1>")
+        with open(os.path.join(self.tmp.name, "blog", "index.html"), 'w') as f:
+            f.write("<h1>Blog</h1>")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def exchange(self, *requests):
+        # Sends the raw requests over one connection; returns everything read back
+        async def run():
+            server = StaticServer(self.tmp.name)
+            tcp_server = await asyncio.start_server(server.handle_client, "127.0.0.1", 0)
+            port = tcp_server.sockets[0].getsockname()[1]
+            async with tcp_server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.write("".join(requests).encode())
+                await writer.drain()
+                data = await reader.read()
+                writer.close()
+                return data.decode("latin-1")
+        return asyncio.run(run())
+
+    def test_keep_alive_serves_several_requests(self):
+        response = self.exchange(
+            "GET / HTTP/1.1\r\nHost: x\r\n\r\n",
+            "GET /blog HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n",
+        )
+        self.assertEqual(response.count("HTTP/1.1 200 OK"), 2)
+        self.assertIn("<h1>Home</h1>", response)
+        self.assertTrue(response.endswith("<h1>Blog</h1>"))
+
+    def test_not_modified(self):
+        first = self.exchange("GET / HTTP/1.1\r\nConnection: close\r\n\r\n")
+        etag = next(line for line in first.split("\r\n") if line.startswith("ETag:")).split(" ", 1)[1]
+        second = self.exchange(f"GET / HTTP/1.1\r\nIf-None-Match: {etag}\r\nConnection: close\r\n\r\n")
+        self.assertTrue(second.startswith("HTTP/1.1 304 Not Modified"))
+        self.assertNotIn("<h1>", second)
+
+    def test_range(self):
+        response = self.exchange("GET /index.html HTTP/1.1\r\nRange: bytes=4-7\r\nConnection: close\r\n\r\n")
+        self.assertTrue(response.startswith("HTTP/1.1 206 Partial Content"))
+        self.assertIn("Content-Range: bytes 4-7/13", response)
+        self.assertTrue(response.endswith("Home"))
+
+    def test_gzip_sidecar(self):
+        with open(os.path.join(self.tmp.name, "index.html.gz"), 'wb') as f:
+            f.write(gzip.compress(b"<h1>Home</h1>", mtime=0))
+        response = self.exchange(
+            "GET / HTTP/1.1\r\nAccept-Encoding: gzip\r\n\r\n",
+            "GET / HTTP/1.1\r\nConnection: close\r\n\r\n",
+        )
+        compressed, plain = response.split("HTTP/1.1 200 OK")[1:]
+        self.assertIn("Content-Encoding: gzip", compressed)
+        self.assertIn("Vary: Accept-Encoding", compressed)
+        self.assertNotIn("Content-Encoding", plain)
+        self.assertIn("Vary: Accept-Encoding", plain)
+        self.assertTrue(plain.endswith("<h1>Home</h1>"))
+        etags = [line for line in response.split("\r\n") if line.startswith("ETag:")]
+        self.assertNotEqual(etags[0], etags[1])
+
+    def test_request_body_closes_connection(self):
+        # The body must not be served as a second request on the same socket
+        smuggled = "GET /index.html HTTP/1.1\r\n\r\n"
+        response = self.exchange(
+            f"POST / HTTP/1.1\r\nContent-Length: {len(smuggled)}\r\n\r\n{smuggled}"
+        )
+        self.assertTrue(response.startswith("HTTP/1.1 405 Method Not Allowed"))
+        self.assertIn("Connection: close", response)
+        self.assertNotIn("200 OK", response)
+        response = self.exchange(
+            f"GET /blog HTTP/1.1\r\nContent-Length: {len(smuggled)}\r\n\r\n{smuggled}"
+        )
+        self.assertEqual(response.count("HTTP/1.1 200 OK"), 1)
+        self.assertNotIn("<h1>Home</h1>", response)
+
+    def test_empty_body_keeps_connection_alive(self):
+        response = self.exchange(
+            "GET / HTTP/1.1\r\nContent-Length: 0\r\n\r\n",
+            "GET /blog HTTP/1.1\r\nConnection: close\r\n\r\n",
+        )
+        self.assertEqual(response.count("HTTP/1.1 200 OK"), 2)
+        self.assertIn("Content-Type: text/html; charset=utf-8", response)
+
+    def test_missing_and_escaping_paths(self):
+        response = self.exchange(
+            "GET /missing.html HTTP/1.1\r\n\r\n",
+            "GET /../secret HTTP/1.1\r\nConnection: close\r\n\r\n",
+        )
+        self.assertEqual(response.count("404 Not Found\r\n"), 2)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,22 @@
+import os, tempfile, unittest
+
+class TempDirTestCase(unittest.TestCase):
+    """Base for tests that build small trees of files in a temporary directory."""
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.dir = tmp.name
+
+    def path(self, *parts):
+        return os.path.join(self.dir, *parts)
+
+    def write(self, rel_path, text):
+        path = self.path(rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write(text)
+        return path
+
+    def read(self, rel_path):
+        with open(self.path(rel_path)) as f:
+            return f.read()
@@ -0,0 +1,106 @@
+import os, unittest
+from src.sync import KEEP_PATTERNS, AtomicWriter, copy_if_changed, remove_orphans
+from src.test_support import TempDirTestCase
+
+class TestSync(TempDirTestCase):
+    def test_atomic_writer_creates_file(self):
+        dest = self.path("out", "index.html")
+        with AtomicWriter(dest) as f:
+            f.write("<p>hi</p>")
+        with open(dest) as f:
+            self.assertEqual(f.read(), "<p>hi</p>")
+        self.assertEqual(os.listdir(self.path("out")), ["index.html"])
+
+    def test_atomic_writer_skips_unchanged(self):
+        dest = self.path("index.html")
+        self.write(dest, "same")
+        os.utime(dest, ns=(0, 0))
+        writer = AtomicWriter(dest)
+        with writer as f:
+            f.write("same")
+        self.assertFalse(writer.changed)
+        self.assertEqual(os.stat(dest).st_mtime_ns, 0)
+
+    def test_atomic_writer_replaces_changed(self):
+        dest = self.path("index.html")
+        self.write(dest, "old")
+        writer = AtomicWriter(dest)
+        with writer as f:
+            f.write("new")
+        self.assertTrue(writer.changed)
+        with open(dest) as f:
+            self.assertEqual(f.read(), "new")
+
+    def test_atomic_writer_error_keeps_old_file(self):
+        dest = self.path("index.html")
+        self.write(dest, "old")
+        with self.assertRaises(RuntimeError):
+            with AtomicWriter(dest) as f:
+                f.write("partial")
+                raise RuntimeError("boom")
+        with open(dest) as f:
+            self.assertEqual(f.read(), "old")
+        self.assertEqual(os.listdir(self.dir), ["index.html"])
+
+    def test_copy_if_changed(self):
+        source = self.path("static", "a.css")
+        dest = self.path("docs", "a.css")
+        self.write(source, "body {}")
+        self.assertTrue(copy_if_changed(source, dest))
+        self.assertFalse(copy_if_changed(source, dest))
+
+    def test_copy_skips_matching_size_and_mtime(self):
+        source = self.path("static", "a.css")
+        dest = self.path("docs", "a.css")
+        self.write(source, "body {}")
+        copy_if_changed(source, dest)
+        self.assertEqual(os.stat(source).st_mtime_ns, os.stat(dest).st_mtime_ns)
+        self.assertFalse(copy_if_changed(source, dest))
+        os.utime(source, ns=(0, 0))
+        self.assertTrue(copy_if_changed(source, dest))
+
+    def test_copy_large_file(self):
+        source = self.path("static", "big.bin")
+        dest = self.path("docs", "big.bin")
+        data = os.urandom(3 * 1024 * 1024 + 17)
+        os.makedirs(os.path.dirname(source))
+        with open(source, 'wb') as f:
+            f.write(data)
+        copy_if_changed(source, dest)
+        with open(dest, 'rb') as f:
+            self.assertEqual(f.read(), data)
+
+    def test_copy_hardlink(self):
+        source = self.path("static", "a.png")
+        dest = self.path("docs", "a.png")
+        self.write(source, "png")
+        os.makedirs(self.path("docs"))
+        self.assertTrue(copy_if_changed(source, dest, hardlink=True))
+        self.assertTrue(os.path.samefile(source, dest))
+        self.assertFalse(copy_if_changed(source, dest, hardlink=True))
+
+    def test_remove_orphans(self):
+        keep = self.path("docs", "index.html")
+        orphan = self.path("docs", "old", "index.html")
+        self.write(keep, "x")
+        self.write(orphan, "x")
+        removed = remove_orphans(self.path("docs"), [keep])
+        self.assertEqual(removed, [orphan])
+        self.assertTrue(os.path.exists(keep))
+        self.assertFalse(os.path.exists(self.path("docs", "old")))
+
+    def test_remove_orphans_keeps_hand_placed_files(self):
+        kept = [
+            self.write(self.path("docs", "CNAME"), "example.com"),
+            self.write(self.path("docs", ".nojekyll"), ""),
+            self.write(self.path("docs", ".well-known", "security.txt"), "x"),
+            self.write(self.path("docs", "downloads", "report.pdf"), "x"),
+        ]
+        orphan = self.write(self.path("docs", "old.html"), "x")
+        removed = remove_orphans(self.path("docs"), [], KEEP_PATTERNS + ("downloads/*",))
+        self.assertEqual(removed, [orphan])
+        for path in kept:
+            self.assertTrue(os.path.exists(path))
+
+if __name__ == "__main__":
+    unittest.main()
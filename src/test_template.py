@@ -0,0 +1,58 @@
+import io, os, tempfile, unittest
+from src.template import Template, load_template
+from src.urls import make_url_rewriter
+
+class TestTemplate(unittest.TestCase):
+    def test_segments(self):
+        template = Template('<title>{{ Title }}</title><a href="/x">{{ Content }}</a>')
+        self.assertEqual(
+            template.segments,
+            [
+                ("text", "<title>"),
+                ("slot", "Title"),
+                ("text", '</title><a href="'),
+                ("url", "/x"),
+                ("text", '">'),
+                ("slot", "Content"),
+                ("text", "</a>"),
+            ],
+        )
+
+    def test_render(self):
+        template = Template("<h1>{{ Title }}</h1>{{ Content }}")
+        self.assertEqual(template.render(Title="Hi", Content="<p>x</p>"), "<h1>Hi</h1><p>x</p>")
+
+    def test_missing_slot_left_in_place(self):
+        template = Template("<h1>{{ Title }}</h1>")
+        self.assertEqual(template.render(), "<h1>{{ Title }}</h1>")
+
+    def test_write_with_chunks(self):
+        template = Template("<main>{{ Content }}</main>")
+        buffer = io.StringIO()
+        template.write(buffer, Content=iter(["<p>", "x", "</p>"]))
+        self.assertEqual(buffer.getvalue(), "<main><p>x</p></main>")
+
+    def test_basepath(self):
+        template = Template('<link href="/index.css"><img src="/a.png"><a href="https://x.com/">{{ Content }}')
+        self.assertEqual(
+            template.render(make_url_rewriter("/Sstatick/"), Content='href="/not-an-attribute"'),
+            '<link href="/Sstatick/index.css"><img src="/Sstatick/a.png"><a href="https://x.com/">href="/not-an-attribute"',
+        )
+
+class TestLoadTemplate(unittest.TestCase):
+    def test_reloads_on_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "template.html")
+            with open(path, 'w') as f:
+                f.write("<p>{{ Content }}</p>")
+            first = load_template(path)
+            self.assertIs(load_template(path), first)
+            with open(path, 'w') as f:
+                f.write("<div>{{ Content }}</div>")
+            os.utime(path, ns=(0, 0))
+            second = load_template(path)
+            self.assertIsNot(second, first)
+            self.assertEqual(second.render(Content="x"), "<div>x</div>")
+
+if __name__ == "__main__":
+    unittest.main()
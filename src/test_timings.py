@@ -0,0 +1,69 @@
+import json, os, tempfile, unittest
+from src.template import Template
+from src.timings import BuildTimer, configure_timings, get_timer, stage
+from src.utils import parse_page, render_page
+
+class TestBuildTimer(unittest.TestCase):
+    def tearDown(self):
+        configure_timings(False)
+
+    def test_records_and_summary(self):
+        timer = BuildTimer()
+        with timer.stage("a.md", "page"):
+            with timer.stage("a.md", "parse"):
+                pass
+        with timer.stage("b.md", "parse"):
+            pass
+        self.assertEqual([record[:2] for record in timer.records], [("a.md", "parse"), ("a.md", "page"), ("b.md", "parse")])
+        self.assertEqual(list(timer.stage_totals()), ["parse"])
+        self.assertEqual(timer.stage_totals()["parse"][0], 2)
+        self.assertEqual([item for _, item in timer.slowest_pages()], ["a.md"])
+        self.assertIn("Slowest pages:", timer.summary())
+        self.assertEqual(len(timer.drain()), 3)
+        self.assertEqual(timer.records, [])
+
+    def test_trace_events(self):
+        timer = BuildTimer()
+        with timer.stage("a.md", "page"):
+            with timer.stage("a.md", "parse"):
+                pass
+        with tempfile.TemporaryDirectory() as tmp:
+            trace_path = os.path.join(tmp, "trace.json")
+            timer.write_trace(trace_path)
+            with open(trace_path) as f:
+                events = json.load(f)["traceEvents"]
+        spans = [event for event in events if event["ph"] == "X"]
+        self.assertEqual([span["name"] for span in spans], ["parse", "a.md"])
+        parse, page = spans
+        self.assertEqual((parse["pid"], parse["tid"]), (page["pid"], page["tid"]))
+        self.assertLessEqual(page["ts"], parse["ts"])
+        self.assertGreaterEqual(page["ts"] + page["dur"], parse["ts"] + parse["dur"])
+        self.assertIn("process_name", [event["name"] for event in events if event["ph"] == "M"])
+
+    def test_stage_is_noop_when_off(self):
+        configure_timings(False)
+        with stage("x", "parse"):
+            pass
+        self.assertIsNone(get_timer())
+
+    def test_timed_render_matches_streamed(self):
+        template = Template('<title>{{ Title }}</title><link href="/index.css">{{ Content }}')
+        with tempfile.TemporaryDirectory() as tmp:
+            markdown_path = os.path.join(tmp, "index.md")
+            with open(markdown_path, 'w') as f:
+                f.write("# Home\n\n![pic](/images/a.png) and [a link](/blog)")
+            html_node, title = parse_page(markdown_path)
+            outputs = []
+            for enabled in (False, True):
+                configure_timings(enabled)
+                dest_path = os.path.join(tmp, f"out-{enabled}.html")
+                render_page(template, html_node, title, dest_path, "/Sstatick/")
+                with open(dest_path) as f:
+                    outputs.append(f.read())
+            self.assertEqual(outputs[0], outputs[1])
+            self.assertEqual(
+                [record[1] for record in get_timer().records], ["to_html", "template", "write"],
+            )
+
+if __name__ == "__main__":
+    unittest.main()
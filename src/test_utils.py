@@ -0,0 +1,72 @@
+import io, os, unittest
+from unittest import mock
+from src import log
+from src.log import BuildLog
+from src.blocktype import markdown_to_html_node
+from src.manifest import BuildManifest
+from src.test_support import TempDirTestCase
+from src.utils import find_pages, generate_page_variants, generate_site, parse_page
+
+class TestGenerateSite(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("content/index.md", "# Home\n\nHello [blog](/blog)")
+        self.write("content/blog/index.md", "# Blog\n\nPost")
+        self.write("content/blog/b.md", "# B\n\nSecond")
+        self.write("content/about.md", "# About\n\nUs")
+        self.write("template.html", "<title>{{ Title }}</title>{{ Content }}")
+        # Page errors are logged; keep them out of the test output
+        previous = log.build_log
+        log.build_log = BuildLog(stream=io.StringIO())
+        self.addCleanup(setattr, log, "build_log", previous)
+
+    def build(self, dest, jobs, manifest=None):
+        return generate_site(
+            self.path("content"), self.path("template.html"), [(self.path(dest), "/", manifest)], jobs,
+        )
+
+    def test_find_pages_is_sorted(self):
+        pages = [rel_path.as_posix() for _, rel_path in find_pages(self.path("content"), "")]
+        self.assertEqual(pages, ["about.html", "blog/b.html", "blog/index.html", "index.html"])
+
+    def test_jobs_match_serial_build(self):
+        serial_outputs, _ = self.build("serial", 1)
+        parallel_outputs, failures = self.build("parallel", 2)
+        self.assertEqual(failures, [])
+        self.assertEqual(len(serial_outputs), len(parallel_outputs))
+        for path in serial_outputs:
+            rel_path = os.path.relpath(path, self.path("serial"))
+            self.assertEqual(self.read(os.path.join("serial", rel_path)), self.read(os.path.join("parallel", rel_path)))
+        self.assertIn('<a href="/blog">blog</a>', self.read("parallel/index.html"))
+
+    def test_parse_page_streams_the_file(self):
+        text = "Intro\n\n# Blog\n\n```\n# not a title\n```\n"
+        self.write("content/stream.md", text)
+        html_node, title = parse_page(self.path("content/stream.md"))
+        self.assertEqual(title, "Blog")
+        self.assertEqual(html_node.to_html(), markdown_to_html_node(text).to_html())
+
+    def test_variants_share_one_parse(self):
+        targets = [(self.path("a/index.html"), "/a/"), (self.path("b/index.html"), "/b/")]
+        with mock.patch("src.utils.parse_page", wraps=parse_page) as parse:
+            generate_page_variants(self.path("content/index.md"), self.path("template.html"), targets)
+        self.assertEqual(parse.call_count, 1)
+        self.assertIn('<a href="/a/blog">blog</a>', self.read("a/index.html"))
+        self.assertIn('<a href="/b/blog">blog</a>', self.read("b/index.html"))
+
+    def test_failed_page_keeps_the_rest(self):
+        # No "# " title, so extract_title raises
+        self.write("content/blog/b.md", "Untitled")
+        for jobs in (1, 2):
+            manifest = BuildManifest.load(
+                self.path(f"manifest-{jobs}.json"), self.path("template.html"), "/",
+            )
+            outputs, failures = self.build(f"docs-{jobs}", jobs, manifest)
+            self.assertEqual([from_path for from_path, _ in failures], [self.path("content/blog/b.md")])
+            self.assertEqual(len(outputs), 4)
+            self.assertFalse(os.path.exists(self.path(f"docs-{jobs}", "blog", "b.html")))
+            self.assertIn("<h1>Home</h1>", self.read(f"docs-{jobs}/index.html"))
+            self.assertEqual(len(manifest.pages), 3)
+
+if __name__ == "__main__":
+    unittest.main()
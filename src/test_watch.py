@@ -0,0 +1,103 @@
+import os, shutil, tempfile, unittest
+from src.test_support import TempDirTestCase
+from src.watch import PollingWatcher, SiteWatcher
+
+class TestSiteWatcher(TempDirTestCase):
+    def setUp(self):
+        super().setUp()
+        self.write("content/index.md", "# Home\n\nHello [blog](/blog)")
+        self.write("content/blog/index.md", "# Blog\n\nPost")
+        self.write("static/index.css", "body {}")
+        self.write("template.html", '<title>{{ Title }}</title><link href="/index.css">{{ Content }}')
+        self.site = SiteWatcher(
+            self.path("content"), self.path("static"), self.path("template.html"),
+            [(self.path("docs"), "/base/")],
+        )
+        self.site.build_all()
+
+    def test_build_all(self):
+        self.assertEqual(
+            self.read("docs/index.html"),
+            '<title>Home</title><link href="/base/index.css"><div><h1>Home</h1><p>Hello <a href="/base/blog">blog</a></p></div>',
+        )
+        self.assertEqual(self.read("docs/index.css"), "body {}")
+
+    def test_load_pages_parses_and_writes_nothing(self):
+        site = SiteWatcher(
+            self.path("content"), self.path("static"), self.path("template.html"),
+            [(self.path("fresh"), "/")],
+        )
+        site.load_pages()
+        self.assertEqual(list(site.pages.values()), [None, None])
+        self.assertFalse(os.path.exists(self.path("fresh")))
+        # A template edit parses the pages it hasn't needed yet
+        site.update_template()
+        self.assertNotIn(None, site.pages.values())
+        self.assertIn("<h1>Blog</h1>", self.read("fresh/blog/index.html"))
+
+    def test_content_change_rebuilds_one_page(self):
+        self.write("content/blog/index.md", "# Blog\n\nEdited")
+        done = self.site.handle({self.path("content/blog/index.md")})
+        self.assertEqual(done, [self.path("content/blog/index.md")])
+        self.assertIn("Edited", self.read("docs/blog/index.html"))
+
+    def test_deleted_page_is_removed(self):
+        os.remove(self.path("content/blog/index.md"))
+        self.site.handle({self.path("content/blog/index.md")})
+        self.assertFalse(os.path.exists(self.path("docs/blog")))
+        self.assertTrue(os.path.exists(self.path("docs/index.html")))
+
+    def test_deleted_directory_drops_its_pages(self):
+        self.write("content/blog/tom/index.md", "# Tom\n\nPost")
+        self.site.handle({self.path("content/blog/tom")})
+        shutil.rmtree(self.path("content/blog"))
+        # Only the directory itself is reported
+        self.site.handle({self.path("content/blog")})
+        self.assertEqual(list(self.site.pages), [self.path("content/index.md")])
+        self.assertFalse(os.path.exists(self.path("docs/blog")))
+
+    def test_template_change_rerenders_without_parsing(self):
+        parsed = dict(self.site.pages)
+        self.write("template.html", "<h1>{{ Title }}</h1>{{ Content }}")
+        os.utime(self.path("template.html"), ns=(0, 0))
+        self.site.handle({self.path("template.html")})
+        self.assertTrue(self.read("docs/blog/index.html").startswith("<h1>Blog</h1>"))
+        for from_path, page in self.site.pages.items():
+            self.assertIs(page, parsed[from_path])
+
+    def test_static_change(self):
+        self.write("static/index.css", "p {}")
+        self.site.handle({self.path("static/index.css")})
+        self.assertEqual(self.read("docs/index.css"), "p {}")
+
+    def test_fingerprint_change_removes_old_name(self):
+        site = SiteWatcher(
+            self.path("content"), self.path("static"), self.path("template.html"),
+            [(self.path("hashed"), "/")], fingerprint=True,
+        )
+        site.build_all()
+        old_path = self.path("hashed", site.assets["/index.css"].lstrip("/"))
+        self.write("static/index.css", "p { color: red }")
+        site.handle({self.path("static/index.css")})
+        new_path = self.path("hashed", site.assets["/index.css"].lstrip("/"))
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(new_path))
+        self.assertIn(site.assets["/index.css"], self.read("hashed/index.html"))
+
+class TestPollingWatcher(unittest.TestCase):
+    def test_reports_changes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "a.md")
+            with open(path, 'w') as f:
+                f.write("a")
+            watcher = PollingWatcher([tmp], interval=0.01)
+            self.assertEqual(watcher.wait(timeout=0), set())
+            with open(path, 'w') as f:
+                f.write("changed")
+            os.utime(path, ns=(0, 0))
+            self.assertEqual(watcher.wait(timeout=1), {path})
+            os.remove(path)
+            self.assertEqual(watcher.wait(timeout=1), {path})
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import contextlib, json, os, threading, time
+
+# Stages that only contain other stages; left out of the per-stage totals
+CONTAINER_STAGES = ("page",)
+
+class BuildTimer:
+    """
+    Collects one record per timed stage:
+    (item, stage, start, seconds, pid, thread id), where item is the page or
+    file the stage worked on and start is a time.perf_counter() value
+    (CLOCK_MONOTONIC, so records from worker processes line up).
+    """
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.records = []
+
+    @contextlib.contextmanager
+    def stage(self, item, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.records.append((
+                os.fspath(item), name, start, time.perf_counter() - start,
+                os.getpid(), threading.get_ident(),
+            ))
+
+    def drain(self):
+        # Hand the records over (e.g. from a worker back to the parent)
+        records, self.records = self.records, []
+        return records
+
+    def stage_totals(self):
+        totals = {}  # stage -> [count, seconds]
+        for _, name, _, seconds, _, _ in self.records:
+            if name in CONTAINER_STAGES:
+                continue
+            total = totals.setdefault(name, [0, 0.0])
+            total[0] += 1
+            total[1] += seconds
+        return totals
+
+    def slowest_pages(self, top=10):
+        pages = [(seconds, item) for item, name, _, seconds, _, _ in self.records if name == "page"]
+        return sorted(pages, reverse=True)[:top]
+
+    def summary(self, top=10):
+        elapsed = time.perf_counter() - self.started
+        lines = [f"Timings ({elapsed * 1000:.1f} ms wall, stages summed over workers and threads):"]
+        for name, (count, seconds) in sorted(self.stage_totals().items(), key=lambda item: -item[1][1]):
+            lines.append(f"  {name:<16} {count:>6} x {seconds * 1000:>10.2f} ms")
+        slowest = self.slowest_pages(top)
+        if slowest:
+            lines.append("Slowest pages:")
+            for seconds, item in slowest:
+                lines.append(f"  {seconds * 1000:>10.2f} ms  {item}")
+        return "\n".join(lines)
+
+    def trace_events(self):
+        """
+        The records as Chrome trace events (chrome://tracing, Perfetto): one
+        complete ("X") event per stage, with pages named after their file,
+        on a track per process and thread.
+        """
+        main_pid = os.getpid()
+        threads = {}  # (pid, thread id) -> small tid for display
+        events = []
+        for item, name, start, seconds, pid, thread_id in self.records:
+            tid = threads.setdefault((pid, thread_id), len(threads) + 1)
+            events.append({
+                "name": item if name in CONTAINER_STAGES else name,
+                "cat": name,
+                "ph": "X",
+                "ts": round((start - self.started) * 1e6, 3),
+                "dur": round(seconds * 1e6, 3),
+                "pid": pid,
+                "tid": tid,
+                "args": {"item": item},
+            })
+        for pid in sorted({pid for pid, _ in threads}):
+            events.append({
+                "name": "process_name", "ph": "M", "pid": pid,
+                "args": {"name": "build" if pid == main_pid else f"worker {pid}"},
+            })
+        for (pid, _), tid in threads.items():
+            events.append({
+                "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                "args": {"name": f"thread {tid}"},
+            })
+        return events
+
+    def write_trace(self, path):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump({"traceEvents": self.trace_events(), "displayTimeUnit": "ms"}, f)
+
+# Timer used by the build in this process, see configure_timings
+timer = None
+
+def configure_timings(enabled):
+    global timer
+    timer = BuildTimer() if enabled else None
+    return timer
+
+def get_timer():
+    return timer
+
+def stage(item, name):
+    # No-op unless timings are on
+    if timer is None:
+        return contextlib.nullcontext()
+    return timer.stage(item, name)
@@ -0,0 +1,18 @@
+# Attributes whose values are URLs that may need rewriting at render time
+URL_ATTRIBUTES = ("href", "src")
+
+def make_url_rewriter(basepath, assets=None):
+    # Site-absolute URLs ("/images/x.png") are served under basepath, e.g.
+    # "/Sstatick/images/x.png". assets maps site-absolute static URLs to
+    # their fingerprinted names ("/index.css" -> "/index.3f9a1c2b.css").
+    # Returns None when there is nothing to rewrite.
+    if basepath == "/" and not assets:
+        return None
+
+    def rewrite_url(url):
+        if url.startswith("/") and not url.startswith("//"):
+            if assets:
+                url = assets.get(url, url)
+            return basepath + url[1:]
+        return url
+    return rewrite_url
@@ -1,7 +1,15 @@
 from src.blocktype import markdown_to_html_node
+from src.block_cache import block_cache_settings, configure_block_cache, get_block_cache
+from src.manifest import hash_file
+from src.template import load_template
+from src.urls import make_url_rewriter
+from src.sync import AtomicWriter, copy_if_changed
+from src.timings import configure_timings, get_timer, stage
+from src.memory import get_memory_report, measure_memory
 from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from src import log
 import os, shutil, urllib.request
-print("Current working directory:", os.getcwd())
 
 def extract_title(markdown):
     lines = markdown.split("\n")
@@ -11,27 +19,78 @@ def extract_title(markdown):
     raise Exception ("No Header")
 
 def generate_page(from_path, template_path, dest_path, basepath):
-    print(f"Generating page from {from_path} to {dest_path} using {template_path}")
-    # Read the markdown file
-    with open(from_path, 'r') as markdown_file:
-        markdown_content = markdown_file.read()
-    # Read the template file
-    with open(template_path, 'r') as template_file:
-        template_content = template_file.read()
-    # Convert markdown to HTML
-    html_node = markdown_to_html_node(markdown_content)
-    html_content = html_node.to_html()
-    # Extract title from markdown
-    title = extract_title(markdown_content)
-    # Replace placeholders in template
-    result_html = template_content.replace("{{ Title }}", title)
-    result_html = result_html.replace("{{ Content }}", html_content)
-    result_html = result_html.replace('href="/',f'href="{basepath}')
-    result_html = result_html.replace('src="/', f'src="{basepath}')
+    generate_page_variants(from_path, template_path, [(dest_path, basepath)])
+
+def generate_page_variants(from_path, template_path, targets, assets=None):
+    # Parse the markdown once and render it once per (dest_path, basepath)
+    # Template is parsed once and reused until template.html changes
+    with stage(from_path, "page"):
+        template = load_template(template_path)
+        html_node, title = parse_page(from_path)
+        for dest_path, basepath in targets:
+            render_page(template, html_node, title, dest_path, basepath, assets)
+
+def generate_page_job(from_path, template_path, targets, assets=None):
+    # Runs in a worker process; returns its timing records and block cache
+    # additions and counts for the parent
+    generate_page_variants(from_path, template_path, targets, assets)
+    timer = get_timer()
+    block_cache = get_block_cache()
+    return (
+        None if timer is None else timer.drain(),
+        None if block_cache is None else block_cache.drain(),
+    )
+
+def init_worker(block_cache_settings, timings):
+    # Workers get their block cache and timer configured like the parent's
+    configure_block_cache(*block_cache_settings)
+    configure_timings(timings)
+
+def watch_for_title(lines, titles):
+    # Passes lines through, adding the first "# " heading line's title to titles
+    for line in lines:
+        if not titles and line.startswith("# "):
+            titles.append(extract_title(line.rstrip("\n")))
+        yield line
+
+def parse_page(from_path):
+    # The file is streamed into the block scanner, so reading happens inside
+    # the parse stage and the whole markdown text is never held in memory
+    titles = []
+    with stage(from_path, "parse"), measure_memory(from_path, "parse"):
+        with open(from_path, 'r') as markdown_file:
+            html_node = markdown_to_html_node(watch_for_title(markdown_file, titles))
+    if not titles:
+        raise Exception ("No Header")
+    return html_node, titles[0]
+
+def render_page(template, html_node, title, dest_path, basepath, assets=None):
+    # Site-absolute href/src values get the basepath (and static files their
+    # fingerprinted names) as they are rendered
+    rewrite_url = make_url_rewriter(basepath, assets)
     #dest_path = "public/blog/post.html"
-    os.makedirs(os.path.dirname(dest_path), exist_ok=True)
-    with open(dest_path, 'w') as html_file:
-        html_file.write(result_html)
+    writer = AtomicWriter(dest_path)
+    if get_timer() is not None or get_memory_report() is not None:
+        # Timed and memory-report builds do each step on its own so they
+        # can be measured apart
+        with stage(dest_path, "to_html"), measure_memory(dest_path, "to_html"):
+            content = html_node.to_html(rewrite_url)
+        with stage(dest_path, "template"):
+            html = template.render(rewrite_url, Title=title, Content=content)
+        with stage(dest_path, "write"):
+            with writer as html_file:
+                html_file.write(html)
+        return writer.changed
+    # Stream the page into the file chunk by chunk instead of building it
+    # as one string; the file is only replaced if its bytes changed
+    with writer as html_file:
+        template.write(
+            html_file,
+            rewrite_url,
+            Title=title,
+            Content=html_node.iter_html(rewrite_url),
+        )
+    return writer.changed
 
 def create_index_md():
     # Ensure 'content' directory exists
@@ -345,7 +404,7 @@ def copy_images():
         except Exception as e:
             print(f"Failed to download {url}: {e}")
     
-def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath):
+def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, basepath, manifest=None, jobs=1):
     """print(f"Processing directory: {dir_path_content}")
     #dir_path_content = 'content' just for understanding
     # Get all entries in the current directory
@@ -375,14 +434,97 @@ def generate_pages_recursive(dir_path_content, template_path, dest_dir_path, bas
                 print(f"Generated HTML file: {dest_file_path}")
         elif os.path.isdir(entry_path):
             generate_pages_recursive(entry_path, template_path, dest_dir_path)"""
-    for filename in os.listdir(dir_path_content):
+    _, failures = generate_site(dir_path_content, template_path, [(dest_dir_path, basepath, manifest)], jobs)
+    if failures:
+        raise Exception(f"{len(failures)} page(s) failed to generate")
+
+def generate_site(dir_path_content, template_path, targets, jobs=1, assets=None):
+    """
+    Generate every page under dir_path_content into each target output tree.
+    targets is a list of (dest_dir_path, basepath, manifest or None); each
+    page is parsed once and rendered once per target that needs it.
+    assets is the fingerprinted static URL map, if any.
+    Returns (outputs, failures): every output path the site consists of,
+    built, skipped or failed, and a (from_path, exception) per page that
+    failed. Pages that built are recorded in their manifests either way.
+    """
+    failures = []
+    page_jobs = []
+    outputs = []
+    with stage(dir_path_content, "discover"):
+        for from_path, rel_path in find_pages(dir_path_content, ""):
+            source_hash = None
+            if any(manifest is not None for _, _, manifest in targets):
+                source_hash = hash_file(from_path)
+            page_targets = []
+            page_manifests = []
+            for dest_dir_path, basepath, manifest in targets:
+                dest_path = Path(dest_dir_path) / rel_path
+                outputs.append(dest_path)
+                # Skip outputs whose markdown hasn't changed since the last build
+                if manifest is not None and manifest.is_fresh(dest_path, source_hash):
+                    log.debug("page_skipped", f"Up to date: {dest_path}", source=from_path, dest=dest_path)
+                    continue
+                page_targets.append((dest_path, basepath))
+                page_manifests.append(manifest)
+            if page_targets:
+                page_jobs.append((from_path, source_hash, page_targets, page_manifests))
+
+    def record(from_path, source_hash, page_targets, page_manifests):
+        # Logged here rather than in the workers so counts and sinks stay in one process
+        for (dest_path, _), manifest in zip(page_targets, page_manifests):
+            log.info("page", f"Generated page from {from_path} to {dest_path}", source=from_path, dest=dest_path)
+            if manifest is not None:
+                manifest.record(dest_path, source_hash)
+
+    if jobs > 1 and len(page_jobs) > 1:
+        timer = get_timer()
+        block_cache = get_block_cache()
+        with ProcessPoolExecutor(
+            max_workers=jobs,
+            initializer=init_worker,
+            initargs=(block_cache_settings(), timer is not None),
+        ) as executor:
+            futures = [
+                executor.submit(generate_page_job, from_path, template_path, page_targets, assets)
+                for from_path, _, page_targets, _ in page_jobs
+            ]
+            # Collect in submission order so the manifest and errors are deterministic
+            for (from_path, source_hash, page_targets, page_manifests), future in zip(page_jobs, futures):
+                try:
+                    records, cache_delta = future.result()
+                except Exception as e:
+                    failures.append((from_path, e))
+                    continue
+                if records:
+                    timer.records.extend(records)
+                if cache_delta:
+                    block_cache.merge(cache_delta)
+                record(from_path, source_hash, page_targets, page_manifests)
+    else:
+        for from_path, source_hash, page_targets, page_manifests in page_jobs:
+            try:
+                generate_page_variants(from_path, template_path, page_targets, assets)
+            except Exception as e:
+                failures.append((from_path, e))
+                continue
+            record(from_path, source_hash, page_targets, page_manifests)
+
+    for from_path, e in failures:
+        log.error("page_failed", f"Failed to generate {from_path}: {e}", source=from_path, error=str(e))
+    return outputs, failures
+
+def find_pages(dir_path_content, dest_dir_path):
+    # Walk the content tree up front so pages can be handed out to workers
+    pages = []
+    for filename in sorted(os.listdir(dir_path_content)):
         from_path = os.path.join(dir_path_content, filename)
         dest_path = os.path.join(dest_dir_path, filename)
         if os.path.isfile(from_path):
-            dest_path = Path(dest_path).with_suffix(".html")
-            generate_page(from_path, template_path, dest_path, basepath)
+            pages.append((from_path, Path(dest_path).with_suffix(".html")))
         else:
-            generate_pages_recursive(from_path, template_path, dest_path, basepath)
+            pages.extend(find_pages(from_path, dest_path))
+    return pages
 
 def copy_static(source_dir, dest_dir):
 # Ensure destination directory exists (create all necessary dirs)
@@ -406,15 +548,34 @@ def copy_static(source_dir, dest_dir):
             print(f"Created directory: {dest_path}")
             copy_static(source_path, dest_path)  # Recursive call
 
-def copy_files_recursive(source_dir_path, dest_dir_path):
+def copy_files_recursive(source_dir_path, dest_dir_path, hardlink=False, max_workers=None):
+    # Returns every destination file, copied or already up to date
+    with stage(source_dir_path, "discover"):
+        pairs = find_static_files(source_dir_path, dest_dir_path)
+
+    def copy(pair):
+        with stage(pair[0], "copy"):
+            return copy_if_changed(pair[0], pair[1], hardlink)
+
+    # Copies are independent and mostly wait on I/O, so run them on threads
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        copied = list(executor.map(copy, pairs))
+    for (from_path, dest_path), was_copied in zip(pairs, copied):
+        if was_copied:
+            log.info("static_copy", f" * {from_path} -> {dest_path}", source=from_path, dest=dest_path)
+    return [dest_path for _, dest_path in pairs]
+
+def find_static_files(source_dir_path, dest_dir_path):
+    # Creates the destination directories on the way
     if not os.path.exists(dest_dir_path):
-        os.mkdir(dest_dir_path)
+        os.makedirs(dest_dir_path)
 
-    for filename in os.listdir(source_dir_path):
+    pairs = []
+    for filename in sorted(os.listdir(source_dir_path)):
         from_path = os.path.join(source_dir_path, filename)
         dest_path = os.path.join(dest_dir_path, filename)
-        print(f" * {from_path} -> {dest_path}")
         if os.path.isfile(from_path):
-            shutil.copy(from_path, dest_path)
+            pairs.append((from_path, dest_path))
         else:
-            copy_files_recursive(from_path, dest_path)
\ No newline at end of file
+            pairs.extend(find_static_files(from_path, dest_path))
+    return pairs
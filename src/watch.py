@@ -0,0 +1,331 @@
+import ctypes, ctypes.util, os, select, struct, time
+from pathlib import Path
+from src.template import load_template
+from src.sync import copy_if_changed, remove_empty_parents
+from src.assets import fingerprint_static
+from src.compress import is_compressible, sidecar_path, write_sidecar
+from src import log
+from src.utils import find_pages, find_static_files, parse_page, render_page
+
+# inotify(7) event bits
+IN_MODIFY = 0x00000002
+IN_ATTRIB = 0x00000004
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_FROM = 0x00000040
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_DELETE = 0x00000200
+IN_DELETE_SELF = 0x00000400
+IN_IGNORED = 0x00008000
+IN_ISDIR = 0x40000000
+WATCH_MASK = (
+    IN_MODIFY | IN_ATTRIB | IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO |
+    IN_CREATE | IN_DELETE | IN_DELETE_SELF
+)
+EVENT_HEADER = struct.Struct("iIII")
+
+# Editors often write a file in several steps; wait this long for the rest
+DEBOUNCE_SECONDS = 0.05
+
+class InotifyWatcher:
+    """
+    Reports changed paths under the recursive roots, plus changes to the
+    individual files (watched through their parent directory, so editors that
+    save by renaming a new file into place are still seen). Linux only.
+    """
+    def __init__(self, roots, files=()):
+        libc_name = ctypes.util.find_library("c")
+        if libc_name is None:
+            raise OSError("libc not found")
+        self.libc = ctypes.CDLL(libc_name, use_errno=True)
+        if not hasattr(self.libc, "inotify_init1"):
+            raise OSError("inotify not available")
+        self.libc.inotify_add_watch.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_uint32]
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.watches = {}  # watch descriptor -> directory path
+        self.recursive = set()
+        for root in roots:
+            self.add_tree(root)
+        for path in files:
+            self.add_dir(os.path.dirname(path) or ".")
+
+    def add_dir(self, dir_path):
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dir_path), WATCH_MASK)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {dir_path}")
+        self.watches[wd] = dir_path
+
+    def add_tree(self, root):
+        # Returns the files found, which may have appeared before the watch
+        found = []
+        for dir_path, _, filenames in os.walk(root):
+            self.add_dir(dir_path)
+            self.recursive.add(dir_path)
+            found.extend(os.path.join(dir_path, filename) for filename in filenames)
+        return found
+
+    def wait(self, timeout=None):
+        changed = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return changed
+        while True:
+            try:
+                data = os.read(self.fd, 64 * 1024)
+            except BlockingIOError:
+                if not select.select([self.fd], [], [], DEBOUNCE_SECONDS)[0]:
+                    return changed
+                continue
+            offset = 0
+            while offset < len(data):
+                wd, mask, _, name_length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + name_length].rstrip(b"\0")
+                offset += name_length
+                dir_path = self.watches.get(wd)
+                if dir_path is None:
+                    continue
+                if mask & IN_IGNORED:
+                    del self.watches[wd]
+                    self.recursive.discard(dir_path)
+                    continue
+                path = os.path.join(dir_path, os.fsdecode(name)) if name else dir_path
+                changed.add(path)
+                if mask & IN_ISDIR and mask & (IN_CREATE | IN_MOVED_TO) and dir_path in self.recursive:
+                    changed.update(self.add_tree(path))
+
+    def close(self):
+        os.close(self.fd)
+
+class PollingWatcher:
+    """Fallback that compares os.scandir snapshots of (mtime, size)."""
+    def __init__(self, roots, files=(), interval=0.5):
+        self.roots = list(roots)
+        self.files = list(files)
+        self.interval = interval
+        self.snapshot = self.scan()
+
+    def scan(self):
+        snapshot = {}
+        for path in self.files:
+            try:
+                stat = os.stat(path)
+            except FileNotFoundError:
+                continue
+            snapshot[path] = (stat.st_mtime_ns, stat.st_size)
+        stack = list(self.roots)
+        while stack:
+            try:
+                entries = list(os.scandir(stack.pop()))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    stat = entry.stat()
+                    snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+        return snapshot
+
+    def wait(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            snapshot = self.scan()
+            changed = {
+                path for path in snapshot.keys() | self.snapshot.keys()
+                if snapshot.get(path) != self.snapshot.get(path)
+            }
+            self.snapshot = snapshot
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+def make_watcher(roots, files=()):
+    try:
+        return InotifyWatcher(roots, files)
+    except (OSError, AttributeError):
+        return PollingWatcher(roots, files)
+
+class SiteWatcher:
+    """
+    Keeps every page's parsed node tree in memory and rebuilds only what a
+    change affects: a markdown edit re-parses that page, a static edit
+    re-syncs that file, and a template edit re-renders every page from the
+    trees it already has (parsing any it hasn't needed yet).
+    targets is a list of (dest_dir_path, basepath). With compress, .gz
+    sidecars are kept in step with the outputs they belong to; with
+    fingerprint, static files get content-hashed names and a static edit
+    that changes a name re-renders every page.
+    """
+    def __init__(self, dir_path_content, dir_path_static, template_path, targets, compress=False, fingerprint=False):
+        self.dir_path_content = os.path.abspath(dir_path_content)
+        self.dir_path_static = os.path.abspath(dir_path_static)
+        self.template_path = os.path.abspath(template_path)
+        self.targets = targets
+        self.compress = compress
+        self.fingerprint = fingerprint
+        self.assets = None
+        self.digests = {}  # see assets.cached_digest
+        self.template = load_template(self.template_path)
+        self.pages = {}  # markdown path -> (html_node, title), or None until first needed
+
+    def page_dests(self, from_path):
+        rel_path = Path(os.path.relpath(from_path, self.dir_path_content)).with_suffix(".html")
+        return [(Path(dest_dir) / rel_path, basepath) for dest_dir, basepath in self.targets]
+
+    def static_dests(self, from_path):
+        rel_path = os.path.relpath(from_path, self.dir_path_static)
+        return [os.path.join(dest_dir, rel_path) for dest_dir, _ in self.targets]
+
+    def build_all(self):
+        if self.fingerprint:
+            self.update_assets()
+        else:
+            for dest_dir, _ in self.targets:
+                for from_path, dest_path in find_static_files(self.dir_path_static, dest_dir):
+                    copy_if_changed(from_path, dest_path)
+                    self.update_sidecar(dest_path)
+        for from_path, _ in find_pages(self.dir_path_content, ""):
+            self.update_page(from_path)
+
+    def load_pages(self, assets=None, digests=None):
+        # Track every page without parsing or writing anything, for outputs a
+        # full build has just produced; assets and digests are that build's
+        # fingerprint map and static digest cache
+        self.assets = assets
+        if digests is not None:
+            self.digests = digests
+        for from_path, _ in find_pages(self.dir_path_content, ""):
+            self.pages[from_path] = None
+
+    def update_page(self, from_path):
+        if not os.path.isfile(from_path):
+            self.pages.pop(from_path, None)
+            for (dest_path, _), (dest_dir, _) in zip(self.page_dests(from_path), self.targets):
+                if os.path.exists(dest_path):
+                    os.remove(dest_path)
+                self.update_sidecar(dest_path)
+                remove_empty_parents(dest_path, dest_dir)
+            return
+        html_node, title = parse_page(from_path)
+        self.pages[from_path] = (html_node, title)
+        self.render(from_path)
+
+    def render(self, from_path):
+        if self.pages[from_path] is None:
+            self.pages[from_path] = parse_page(from_path)
+        html_node, title = self.pages[from_path]
+        for dest_path, basepath in self.page_dests(from_path):
+            if render_page(self.template, html_node, title, dest_path, basepath, self.assets):
+                self.update_sidecar(dest_path)
+
+    def update_assets(self):
+        # Returns True if any fingerprinted name changed
+        previous = self.assets
+        for dest_dir, _ in self.targets:
+            outputs, self.assets = fingerprint_static(self.dir_path_static, dest_dir, digests=self.digests)
+            for dest_path in outputs:
+                self.update_sidecar(dest_path)
+            # Nothing links to the old name of a changed or deleted file
+            for url, hashed_url in (previous or {}).items():
+                if self.assets.get(url) == hashed_url:
+                    continue
+                stale_path = os.path.join(dest_dir, *hashed_url.lstrip("/").split("/"))
+                if os.path.isfile(stale_path):
+                    os.remove(stale_path)
+                self.update_sidecar(stale_path)
+                remove_empty_parents(stale_path, dest_dir)
+        return self.assets != previous
+
+    def update_static(self, from_path):
+        if self.fingerprint:
+            if self.update_assets():
+                self.update_template()
+            return
+        for dest_path, (dest_dir, _) in zip(self.static_dests(from_path), self.targets):
+            if os.path.isfile(from_path):
+                os.makedirs(os.path.dirname(dest_path), exist_ok=True)
+                copy_if_changed(from_path, dest_path)
+                self.update_sidecar(dest_path)
+                continue
+            if os.path.isfile(dest_path):
+                os.remove(dest_path)
+            self.update_sidecar(dest_path)
+            remove_empty_parents(dest_path, dest_dir)
+
+    def update_sidecar(self, dest_path):
+        # A stale sidecar would be served instead of the fresh output
+        if not self.compress or not is_compressible(dest_path):
+            return
+        gz_path = None
+        if os.path.isfile(dest_path):
+            gz_path, _ = write_sidecar(dest_path)
+        if gz_path is None and os.path.isfile(sidecar_path(dest_path)):
+            os.remove(sidecar_path(dest_path))
+
+    def update_template(self):
+        self.template = load_template(self.template_path)
+        for from_path in sorted(self.pages):
+            self.render(from_path)
+
+    def handle(self, changed_paths):
+        # Returns a short description of what was rebuilt
+        done = []
+        template_changed = False
+        for path in sorted(os.path.abspath(path) for path in changed_paths):
+            if path == self.template_path:
+                template_changed = True
+            elif path.startswith(self.dir_path_content + os.sep):
+                if os.path.isdir(path):
+                    from_paths = [os.path.abspath(from_path) for from_path, _ in find_pages(path, "")]
+                elif path.endswith(".md"):
+                    from_paths = [path]
+                elif not os.path.exists(path):
+                    # A deleted directory; inotify doesn't report its files
+                    from_paths = [from_path for from_path in self.pages if from_path.startswith(path + os.sep)]
+                else:
+                    from_paths = []
+                for from_path in from_paths:
+                    # A new directory reports its files as well as itself
+                    if from_path not in done:
+                        self.update_page(from_path)
+                        done.append(from_path)
+            elif path.startswith(self.dir_path_static + os.sep) and not os.path.isdir(path):
+                self.update_static(path)
+                done.append(path)
+        if template_changed:
+            self.update_template()
+            done.append(f"{len(self.pages)} pages for {self.template_path}")
+        return done
+
+    def run(self, watcher):
+        log.report(f"Watching {self.dir_path_content}, {self.dir_path_static} and {self.template_path}")
+        while True:
+            changed = watcher.wait()
+            start = time.perf_counter()
+            try:
+                done = self.handle(changed)
+            except Exception as e:
+                log.error("rebuild_failed", f"Rebuild failed: {e}", error=str(e))
+                continue
+            if done:
+                elapsed = (time.perf_counter() - start) * 1000
+                log.report(f"Rebuilt {', '.join(done)} in {elapsed:.1f} ms", rebuilt=done, ms=elapsed)
+
+def watch_site(dir_path_content, dir_path_static, template_path, targets, compress=False, fingerprint=False, assets=None, digests=None):
+    # Called right after a full build, so the outputs are already up to date
+    site = SiteWatcher(dir_path_content, dir_path_static, template_path, targets, compress, fingerprint)
+    # Parse everything once up front so later edits only touch what changed
+    site.load_pages(assets, digests)
+    watcher = make_watcher([dir_path_content, dir_path_static], [template_path])
+    try:
+        site.run(watcher)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        watcher.close()